@@ -0,0 +1,170 @@
+# Dijkstras_APSP.py
+"""
+All-pairs shortest path distance matrices.
+
+    "fw"        blocked (tiled) Floyd-Warshall in NumPy. The matrix is split
+                into BLOCK x BLOCK tiles. For every diagonal tile k, three
+                phases run: the tile itself, then its row and column of tiles,
+                then every other tile. Each round keeps the k-th row and
+                column strips (BLOCK x V each) in memory and streams the
+                other tile rows through one BLOCK x V strip at a time, so
+                the working set is about three strips, O(BLOCK * V), even
+                when the matrix is a memmap on disk. O(V^3) work, but all
+                of it is vectorized.
+    "dijkstra"  one lazy-heap Dijkstra per source via dijkstra_many(),
+                O(V (E + V) log V) interpreted steps, optionally spread
+                across worker processes.
+
+all_pairs() picks an engine with choose_apsp_engine() unless one is given.
+Row i / column j of the result are dense node IDs (graph.node_ids maps them
+back), and unreachable pairs are inf. With out_path the result is a
+numpy.memmap, so a matrix larger than RAM is never held in memory twice.
+"""
+from typing import Optional, Union
+import math
+import os
+import tempfile
+
+import numpy as np
+
+from Dijkstras_Batch import dijkstra_many
+from Dijkstras_CSR import CSRGraph, Graph, as_csr
+
+BLOCK = 256  # tile edge length for the blocked Floyd-Warshall engine
+FW_COST_RATIO = 100  # one interpreted Dijkstra step costs about as much as this many vectorized min-plus updates
+
+def choose_apsp_engine(graph: Union[CSRGraph, Graph], workers: int = 1) -> str:
+    """
+    "fw" when V^3 vectorized updates are cheaper than V Dijkstra runs of
+    about E + V log V interpreted steps each (shared over `workers`).
+    """
+    csr = as_csr(graph)
+    n, m = csr.num_nodes, csr.num_edges
+    if n < 2:
+        return "fw"
+    dijkstra_steps = n * (m + n * math.log2(n)) / max(1, workers)
+    return "fw" if n ** 3 <= FW_COST_RATIO * dijkstra_steps else "dijkstra"
+
+def _new_matrix(n: int, dtype, out_path: Optional[str]) -> np.ndarray:
+    if out_path is None:
+        return np.empty((n, n), dtype=dtype)
+    return np.memmap(out_path, dtype=dtype, mode="w+", shape=(n, n))
+
+def _min_plus_update(c: np.ndarray, a: np.ndarray, b: np.ndarray, scratch: np.ndarray) -> None:
+    """c = min(c, a (min,+) b) in place, one rank-1 update per k."""
+    s = scratch[:c.shape[0], :c.shape[1]]
+    for k in range(a.shape[1]):
+        np.add(a[:, k, None], b[None, k, :], out=s)
+        np.minimum(c, s, out=c)
+
+def _fw_tile(d: np.ndarray) -> None:
+    """Plain Floyd-Warshall inside one diagonal tile."""
+    for k in range(d.shape[0]):
+        np.minimum(d, d[:, k, None] + d[None, k, :], out=d)
+
+def floyd_warshall(
+    graph: Union[CSRGraph, Graph],
+    dtype=np.float64,
+    out_path: Optional[str] = None,
+    block: int = BLOCK,
+) -> np.ndarray:
+    """Blocked Floyd-Warshall; parallel edges keep the lightest weight."""
+    csr = as_csr(graph)
+    n = csr.num_nodes
+    offsets, targets, weights = csr.to_numpy()
+    dist = _new_matrix(n, dtype, out_path)
+
+    bounds = [(i, min(i + block, n)) for i in range(0, n, block)]
+    # Initialize tile rows one at a time so a memmap is filled without an n x n temporary
+    rows = np.repeat(np.arange(n), np.diff(offsets))
+    for r0, r1 in bounds:
+        tile = np.full((r1 - r0, n), np.inf, dtype=dtype)
+        lo, hi = offsets[r0], offsets[r1]
+        np.minimum.at(tile, (rows[lo:hi] - r0, targets[lo:hi]), weights[lo:hi].astype(dtype))
+        idx = np.arange(r1 - r0)
+        tile[idx, idx + r0] = np.minimum(tile[idx, idx + r0], 0)
+        dist[r0:r1] = tile
+
+    scratch = np.empty((block, block), dtype=dtype)
+    for k0, k1 in bounds:
+        # Phase 1: the diagonal tile
+        kk = np.array(dist[k0:k1, k0:k1])
+        _fw_tile(kk)
+        dist[k0:k1, k0:k1] = kk
+        # Phase 2: tiles in row k and column k
+        row_k = np.array(dist[k0:k1])
+        col_k = np.array(dist[:, k0:k1])
+        for j0, j1 in bounds:
+            if j0 != k0:
+                tile = row_k[:, j0:j1]
+                _min_plus_update(tile, kk, tile.copy(), scratch)
+        for i0, i1 in bounds:
+            if i0 != k0:
+                tile = col_k[i0:i1]
+                _min_plus_update(tile, tile.copy(), kk, scratch)
+        row_k[:, k0:k1] = kk
+        col_k[k0:k1] = kk
+        dist[k0:k1] = row_k
+        dist[:, k0:k1] = col_k
+        # Phase 3: every remaining tile, one tile row at a time
+        for i0, i1 in bounds:
+            if i0 == k0:
+                continue
+            strip = np.array(dist[i0:i1])
+            a = col_k[i0:i1]
+            for j0, j1 in bounds:
+                if j0 != k0:
+                    _min_plus_update(strip[:, j0:j1], a, row_k[:, j0:j1], scratch)
+            dist[i0:i1] = strip
+
+    if isinstance(dist, np.memmap):
+        dist.flush()
+    return dist
+
+def all_pairs(
+    graph: Union[CSRGraph, Graph],
+    method: Optional[str] = None,
+    dtype=np.float64,
+    out_path: Optional[str] = None,
+    workers: int = 1,
+    block: int = BLOCK,
+) -> np.ndarray:
+    """
+    V x V shortest path distance matrix.
+
+    method is "fw", "dijkstra" or None (choose_apsp_engine()). dtype is
+    np.float64 or np.float32; float32 halves the memory but rounds
+    distances to about 7 significant digits. With out_path the result is a
+    numpy.memmap backed by that file.
+    """
+    csr = as_csr(graph)
+    if len(csr.weights) and min(csr.weights) < 0:
+        raise ValueError("all_pairs() requires non-negative edge weights")
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64")
+    if method is None:
+        method = choose_apsp_engine(csr, workers)
+
+    if method == "fw":
+        return floyd_warshall(csr, dtype, out_path, block)
+    if method != "dijkstra":
+        raise ValueError(f"unknown all-pairs method {method!r}")
+
+    n = csr.num_nodes
+    if dtype == np.float64 and out_path is not None:
+        return dijkstra_many(csr, csr.node_ids, workers=workers, out_path=out_path)
+    # dijkstra_many() writes float64 rows to a file; convert them in tile rows
+    fd, tmp_path = tempfile.mkstemp(suffix=".dist")
+    os.close(fd)
+    try:
+        rows = dijkstra_many(csr, csr.node_ids, workers=workers, out_path=tmp_path)
+        dist = _new_matrix(n, dtype, out_path)
+        for r0 in range(0, n, block):
+            dist[r0:r0 + block] = rows[r0:r0 + block]
+        del rows
+    finally:
+        os.remove(tmp_path)
+    if isinstance(dist, np.memmap):
+        dist.flush()
+    return dist
@@ -0,0 +1,227 @@
+# Dijkstras_Batch.py
+"""
+Many-source shortest paths across a process pool with a shared-memory graph.
+
+dijkstra_many(graph, sources, workers=N) copies the CSR arrays once into a
+multiprocessing.shared_memory block. Worker processes attach to it in their
+pool initializer and wrap the buffer in a CSRGraph without copying, so the
+graph is never pickled per task. Sources are sent in chunks, and every worker
+reuses one DijkstraWorkspace for all of its queries.
+
+Results are returned in one of two forms:
+    a distance matrix   a file-backed numpy.memmap of shape (len(sources), V),
+                        where row i holds the distances from sources[i] and
+                        workers write their rows directly into the file
+    per-source reductions (reduce=...)
+                        only small summaries come back, e.g. "reachable",
+                        "sum" or "max" of the finite distances
+
+map_shared() is the same pool machinery for other per-source analyses
+(see Dijkstras_Centrality): a setup function builds per-worker state on the
+shared graph, and a chunk function runs on it.
+"""
+from array import array
+from functools import partial
+from multiprocessing import Pool, shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+from Dijkstras_CSR import INF, CSRGraph, Graph, Node, as_csr
+from Dijkstras_Workspace import DijkstraWorkspace
+
+CHUNKS_PER_WORKER = 4  # smaller chunks balance load, larger ones cut IPC
+
+REDUCTIONS = ("reachable", "sum", "max")
+
+class SharedCSR:
+    """The offsets/targets/weights arrays of a CSRGraph in one shared-memory block."""
+
+    def __init__(self, graph: Union[CSRGraph, Graph]) -> None:
+        g = as_csr(graph)
+        n, m = g.num_nodes, g.num_edges
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * (n + 1) + 16 * m))
+        pos = 0
+        for arr in (g.offsets, g.targets, g.weights):
+            size = 8 * len(arr)
+            self.shm.buf[pos:pos + size] = memoryview(arr).cast("B")
+            pos += size
+        self.spec = (self.shm.name, n, m)
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+def attach_shared_csr(spec: Tuple[str, int, int]) -> Tuple[shared_memory.SharedMemory, CSRGraph]:
+    """Attach to a SharedCSR block by its spec; the returned CSRGraph is a zero-copy view."""
+    name, n, m = spec
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block; pool workers share the
+        # parent's resource tracker, so this is a no-op there
+        shm = shared_memory.SharedMemory(name=name)
+    buf = shm.buf
+    a, b = 8 * (n + 1), 8 * (n + 1) + 8 * m
+    offsets = buf[:a].cast("q")
+    targets = buf[a:b].cast("q")
+    weights = buf[b:b + 8 * m].cast("d")
+    return shm, CSRGraph(offsets, targets, weights, range(n))
+
+# Worker side
+
+_worker: Dict[str, object] = {}  # pool processes only: the attached block and the setup() state
+
+def _init_worker(spec: Tuple[str, int, int], setup: Callable[[CSRGraph], object]) -> None:
+    shm, graph = attach_shared_csr(spec)
+    _worker["shm"] = shm  # keep the mapping alive for the life of the process
+    _worker["state"] = setup(graph)
+
+def _call_worker(func: Callable[[object, object], object], task: object) -> object:
+    return func(_worker["state"], task)
+
+def map_shared(
+    graph: CSRGraph,
+    setup: Callable[[CSRGraph], object],
+    func: Callable[[object, object], object],
+    tasks: Sequence[object],
+    workers: int,
+) -> list:
+    """
+    func(state, task) for every task, in completion order. state is
+    setup(graph) built once per worker process on a zero-copy view of a
+    SharedCSR, or once in-process for workers=1. The graph a worker sees
+    always has dense IDs 0..V-1. setup and func must be module-level
+    functions so the pool can pickle them.
+    """
+    if workers == 1:
+        # Same dense-ID view of the arrays that the pool workers attach to
+        state = setup(CSRGraph(graph.offsets, graph.targets, graph.weights, range(graph.num_nodes)))
+        return [func(state, task) for task in tasks]
+    shared = SharedCSR(graph)
+    try:
+        with Pool(workers, initializer=_init_worker, initargs=(shared.spec, setup)) as pool:
+            return list(pool.imap_unordered(partial(_call_worker, func), tasks))
+    finally:
+        shared.close()
+
+def split_chunks(items: Sequence, workers: int) -> List[Tuple[int, Sequence]]:
+    """(start, items[start:start + chunk]) pairs, about CHUNKS_PER_WORKER per worker."""
+    chunk = max(1, -(-len(items) // (workers * CHUNKS_PER_WORKER)))
+    return [(i, items[i:i + chunk]) for i in range(0, len(items), chunk)]
+
+def _reduce(ws: DijkstraWorkspace, names: Sequence[str]) -> Tuple[float, ...]:
+    dist = ws.dist
+    values = [dist[u] for u in ws.order]
+    out = []
+    for name in names:
+        if name == "reachable":
+            out.append(float(len(values)))
+        elif name == "sum":
+            out.append(sum(values))
+        else:
+            out.append(max(values))
+    return tuple(out)
+
+def _setup_rows(graph: CSRGraph) -> Dict[str, object]:
+    return {"ws": DijkstraWorkspace(graph), "outputs": {}}
+
+def _run_chunk(state: Dict[str, object], task) -> List[Tuple[int, Tuple[float, ...]]]:
+    row_start, sources, out_path, reductions = task
+    ws: DijkstraWorkspace = state["ws"]
+    n = ws.graph.num_nodes
+    results = []
+    matrix = None
+    if out_path is not None:
+        outputs = state["outputs"]
+        matrix = outputs.get(out_path)
+        if matrix is None:
+            matrix = outputs[out_path] = np.memmap(out_path, dtype=np.float64, mode="r+")
+    for i, s in enumerate(sources):
+        ws.run(s)
+        if matrix is not None:
+            row = array("d", [INF]) * n
+            dist = ws.dist
+            for u in ws.order:
+                row[u] = dist[u]
+            start = (row_start + i) * n
+            matrix[start:start + n] = np.frombuffer(row, dtype=np.float64)
+        if reductions:
+            results.append((row_start + i, _reduce(ws, reductions)))
+    if matrix is not None:
+        matrix.flush()
+    return results
+
+# Driver
+
+def dijkstra_many(
+    graph: Union[CSRGraph, Graph],
+    sources: Sequence[Node],
+    workers: Optional[int] = None,
+    out_path: Optional[str] = None,
+    reduce: Optional[Sequence[str]] = None,
+):
+    """
+    Single-source shortest paths from every node in `sources`.
+
+    Without `reduce`, returns a numpy.memmap of shape (len(sources), V) with
+    inf for unreachable nodes. Columns are dense node IDs (graph.node_ids maps
+    them back). The file is `out_path`, or else a temporary file. On POSIX
+    it is deleted at once (the mapping keeps the data); on Windows, when
+    the returned memmap and all views of it are freed.
+
+    With `reduce` (a sequence of names from REDUCTIONS), no matrix is written.
+    The result is a dict name -> array('d') aligned with `sources`.
+
+    `workers` defaults to os.cpu_count(); workers=1 runs in-process.
+    """
+    g = as_csr(graph)
+    n = g.num_nodes
+    dense_sources = [g.dense_id(s) for s in sources]
+    workers = workers or os.cpu_count() or 1
+    reductions = tuple(reduce) if reduce else ()
+    unknown = [r for r in reductions if r not in REDUCTIONS]
+    if unknown:
+        raise ValueError(f"unknown reduction(s): {', '.join(unknown)}")
+
+    if not dense_sources:
+        return {name: array("d") for name in reductions} if reductions else np.empty((0, n))
+
+    matrix = None
+    tmp_path = None
+    if not reductions:
+        if out_path is None:
+            fd, tmp_path = tempfile.mkstemp(suffix=".dist")
+            os.close(fd)
+            out_path = tmp_path
+        matrix = np.memmap(out_path, dtype=np.float64, mode="w+", shape=(len(sources), n))
+        matrix.flush()
+
+    try:
+        tasks = [(i, chunk, out_path if matrix is not None else None, reductions)
+                 for i, chunk in split_chunks(dense_sources, workers)]
+        results: List[Tuple[int, Tuple[float, ...]]] = []
+        for part in map_shared(g, _setup_rows, _run_chunk, tasks, workers):
+            results.extend(part)
+    finally:
+        if tmp_path is not None:
+            _remove_mapped(matrix, tmp_path)
+
+    if matrix is not None:
+        return matrix  # workers wrote through their own mappings of the same file
+    out = {name: array("d", [0.0]) * len(sources) for name in reductions}
+    for row, values in results:
+        for name, value in zip(reductions, values):
+            out[name][row] = value
+    return out
+
+def _remove_mapped(matrix: np.memmap, path: str) -> None:
+    """Delete the file behind matrix now if possible, else once its mapping is freed."""
+    try:
+        os.remove(path)  # POSIX: the mapping keeps the data
+    except PermissionError:
+        # Windows cannot delete a mapped file; finalize reports a failure instead of hiding it
+        weakref.finalize(matrix._mmap, os.remove, path)
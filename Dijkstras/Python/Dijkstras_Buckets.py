@@ -0,0 +1,211 @@
+# Dijkstras_Buckets.py
+"""
+Dijkstra variants on monotone integer priority queues, for bounded or
+integer edge weights where a comparison heap is overkill.
+
+    "01bfs"  weights in {0, 1}: deque, O(V + E)
+    "dial"   small integer weights <= C: circular array of C + 1 buckets,
+             O(E + V * C)
+    "radix"  any non-negative integer weights: radix heap, O(E + V log C)
+    "heap"   anything else: the CSR engine with the lazy heapq backend
+
+dijkstra_bucket() picks the engine from weight_stats() unless one is given.
+Float weights can be used with the integer engines by passing `scale`: each
+weight is rounded to round(w * scale) and distances are divided by scale, so
+results are exact only when every weight is a multiple of 1 / scale.
+"""
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Union
+
+from Dijkstras_CSR import INF, CSRGraph, DistanceView, Graph, Node, as_csr
+from Dijkstras_PQ import dijkstra_pq
+
+DIAL_MAX_WEIGHT = 256  # largest integer weight for which Dial's buckets are used
+
+def weight_stats(graph: Union[CSRGraph, Graph]) -> Dict[str, object]:
+    """min/max weight, whether all weights are integers, and whether all are 0 or 1."""
+    weights = as_csr(graph).weights
+    if not weights:
+        return {"min": 0.0, "max": 0.0, "integral": True, "binary": True}
+    return {
+        "min": min(weights),
+        "max": max(weights),
+        "integral": all(map(float.is_integer, weights)),
+        "binary": set(weights) <= {0.0, 1.0},
+    }
+
+def choose_bucket_engine(stats: Dict[str, object], max_dial_weight: int = DIAL_MAX_WEIGHT) -> str:
+    if stats["min"] < 0:
+        raise ValueError("Dijkstra's algorithm requires non-negative edge weights")
+    if stats["binary"]:
+        return "01bfs"
+    if stats["integral"]:
+        return "dial" if stats["max"] <= max_dial_weight else "radix"
+    return "heap"
+
+def _int_weights(graph: CSRGraph, scale: Optional[float]) -> List[int]:
+    if scale is None:
+        if not all(map(float.is_integer, graph.weights)):
+            raise ValueError("integer queue engines need integral weights; pass scale for fractional ones")
+        return [int(w) for w in graph.weights]
+    return [round(w * scale) for w in graph.weights]
+
+def _finish(dist: List[int], graph: CSRGraph, scale: Optional[float]) -> DistanceView:
+    out = array("d", dist)
+    if scale is not None:
+        for i, d in enumerate(out):
+            out[i] = d / scale
+    return DistanceView(out, graph)
+
+def dijkstra_01bfs(graph: Union[CSRGraph, Graph], source: Node, scale: Optional[float] = None,
+                   pred: Optional[array] = None) -> DistanceView:
+    """0-1 BFS: 0-weight edges go to the front of the deque, 1-weight edges to the back."""
+    graph = as_csr(graph)
+    s = graph.dense_id(source)
+    offsets, targets = graph.offsets, graph.targets
+    weights = _int_weights(graph, scale)
+
+    dist: List = [INF] * graph.num_nodes
+    dist[s] = 0
+    dq = deque([(0, s)])
+    while dq:
+        d_u, u = dq.popleft()
+        if d_u > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            w = weights[i]
+            new_dist = d_u + w
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                if pred is not None:
+                    pred[v] = u
+                if w:
+                    dq.append((new_dist, v))
+                else:
+                    dq.appendleft((new_dist, v))
+    return _finish(dist, graph, scale)
+
+def dijkstra_dial(graph: Union[CSRGraph, Graph], source: Node, scale: Optional[float] = None,
+                  pred: Optional[array] = None) -> DistanceView:
+    """
+    Dial's algorithm. Every queued distance lies in [d, d + C] for the current
+    distance d, so C + 1 buckets used circularly hold the whole queue.
+    """
+    graph = as_csr(graph)
+    s = graph.dense_id(source)
+    offsets, targets = graph.offsets, graph.targets
+    weights = _int_weights(graph, scale)
+
+    num_buckets = (max(weights) if weights else 0) + 1
+    buckets: List[List[int]] = [[] for _ in range(num_buckets)]
+    dist: List = [INF] * graph.num_nodes
+    dist[s] = 0
+    buckets[0].append(s)
+    queued = 1
+    d_u = 0
+
+    while queued:
+        bucket = buckets[d_u % num_buckets]
+        while not bucket:
+            d_u += 1
+            bucket = buckets[d_u % num_buckets]
+        u = bucket.pop()
+        queued -= 1
+        if dist[u] != d_u:
+            continue  # stale entry
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_dist = d_u + weights[i]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                if pred is not None:
+                    pred[v] = u
+                buckets[new_dist % num_buckets].append(v)
+                queued += 1
+    return _finish(dist, graph, scale)
+
+def dijkstra_radix(graph: Union[CSRGraph, Graph], source: Node, scale: Optional[float] = None,
+                   pred: Optional[array] = None) -> DistanceView:
+    """
+    Radix heap: bucket i holds keys whose highest bit differing from the last
+    extracted key is bit i - 1 (bucket 0 holds keys equal to it). When bucket 0
+    runs dry, the first non-empty bucket is redistributed around its minimum.
+    """
+    graph = as_csr(graph)
+    s = graph.dense_id(source)
+    offsets, targets = graph.offsets, graph.targets
+    weights = _int_weights(graph, scale)
+
+    max_key = sum(weights) + 1
+    buckets: List[List] = [[] for _ in range(max_key.bit_length() + 1)]
+    dist: List = [INF] * graph.num_nodes
+    dist[s] = 0
+    buckets[0].append((0, s))
+    queued = 1
+    last = 0
+
+    while queued:
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            items = buckets[i]
+            buckets[i] = []
+            last = min(items)[0]
+            for key, v in items:
+                buckets[(key ^ last).bit_length()].append((key, v))
+        d_u, u = buckets[0].pop()
+        queued -= 1
+        if d_u > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_dist = d_u + weights[i]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                if pred is not None:
+                    pred[v] = u
+                buckets[(new_dist ^ last).bit_length()].append((new_dist, v))
+                queued += 1
+    return _finish(dist, graph, scale)
+
+BUCKET_ENGINES = {
+    "01bfs": dijkstra_01bfs,
+    "dial": dijkstra_dial,
+    "radix": dijkstra_radix,
+}
+
+def dijkstra_bucket(
+    graph: Union[CSRGraph, Graph],
+    source: Node,
+    engine: Optional[str] = None,
+    scale: Optional[float] = None,
+    pred: Optional[array] = None,
+) -> DistanceView:
+    """
+    Shortest path distances from `source` using a monotone integer queue.
+
+    `engine` is one of "01bfs", "dial", "radix" or "heap"; by default it is
+    chosen from weight_stats(), of the scaled weights if `scale` is given.
+    Without `scale`, the integer engines raise ValueError on fractional
+    weights rather than truncating them. Computing the stats is a pass over
+    all edges, so callers running many queries on one graph should choose
+    once with choose_bucket_engine() and pass the result in.
+    """
+    graph = as_csr(graph)
+    if engine is None:
+        if scale is None:
+            engine = choose_bucket_engine(weight_stats(graph))
+        else:
+            weights = _int_weights(graph, scale)
+            engine = choose_bucket_engine({
+                "min": min(weights, default=0),
+                "max": max(weights, default=0),
+                "integral": True,
+                "binary": set(weights) <= {0, 1},
+            })
+    if engine == "heap":
+        return dijkstra_pq(graph, source, pred=pred)
+    return BUCKET_ENGINES[engine](graph, source, scale, pred)
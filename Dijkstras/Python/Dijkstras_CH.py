@@ -0,0 +1,350 @@
+# Dijkstras_CH.py
+"""
+Contraction hierarchies (CH) for fast point-to-point queries on a static graph.
+
+Preprocessing contracts nodes one at a time in order of importance. When v is
+contracted, a shortcut u -> w of weight w(u, v) + w(v, w) is added for every
+in-neighbour u and out-neighbour w whose shortest u-w path goes through v. A
+bounded witness search (hop and distance limits) looks for a path around v;
+if it cannot find one, the shortcut is added. Importance is the edge
+difference (shortcuts added minus edges removed) plus the number of already
+contracted neighbours. It is recomputed for the neighbours of each contracted
+node and checked again lazily when a node reaches the top of the queue.
+
+Every edge ends up stored once at its lower-ranked endpoint:
+    up[u]    edges u -> w with rank[w] > rank[u]
+    down[u]  edges x -> u with rank[x] > rank[u], stored reversed (u -> x)
+A query runs a forward search from s over `up` and a backward search from t
+over `down`. Both only move upwards in rank, so each settles a small set of
+nodes, and stall-on-demand prunes nodes that a higher node reaches more
+cheaply. Shortcuts remember their middle node, which is used to unpack paths.
+"""
+from array import array
+from typing import Dict, Hashable, List, Sequence, Tuple, Union
+import heapq
+import json
+import sys
+
+from Dijkstras_CSR import INF, CSRGraph, Graph, Node, as_csr
+
+CH_FILE_MAGIC = "CH01"
+
+WITNESS_HOP_LIMIT = 5         # hops explored by a witness search
+WITNESS_SETTLE_LIMIT = 500    # nodes settled by a witness search
+
+def _to_csr(adjacency: List[List[Tuple[int, float, int]]], node_ids, node_index) -> Tuple[CSRGraph, array]:
+    """Pack per-node (target, weight, middle) lists into a CSRGraph plus a middle array."""
+    offsets = array("q", [0])
+    targets = array("q")
+    weights = array("d")
+    middle = array("q")
+    for edges in adjacency:
+        for v, w, m in edges:
+            targets.append(v)
+            weights.append(w)
+            middle.append(m)
+        offsets.append(len(targets))
+    return CSRGraph(offsets, targets, weights, node_ids, node_index), middle
+
+class _Contractor:
+    """Mutable remaining graph used while building the hierarchy."""
+
+    def __init__(self, graph: CSRGraph, hop_limit: int, settle_limit: int) -> None:
+        n = graph.num_nodes
+        self.hop_limit = hop_limit
+        self.settle_limit = settle_limit
+        # out[u][v] = (weight, middle) and inn[v][u] = (weight, middle); parallel edges keep the lightest
+        self.out: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        self.inn: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        for u in range(n):
+            for v, w in graph.neighbors(u):
+                if w < 0:
+                    raise ValueError("Dijkstra's algorithm requires non-negative edge weights")
+                if u != v and w < self.out[u].get(v, (INF,))[0]:
+                    self.out[u][v] = (w, -1)
+                    self.inn[v][u] = (w, -1)
+        self.deleted_neighbors = [0] * n
+
+    def witness_distances(self, u: int, skip: int, limit: float, targets) -> Dict[int, float]:
+        """Bounded Dijkstra from u that avoids `skip` and stops once all targets are settled."""
+        out = self.out
+        dist = {u: 0.0}
+        hops = {u: 0}
+        heap = [(0.0, u)]
+        settled = 0
+        remaining = len(targets) - (u in targets)
+        while heap:
+            d_x, x = heapq.heappop(heap)
+            if d_x > dist[x]:
+                continue
+            settled += 1
+            if d_x > limit or settled > self.settle_limit:
+                break
+            if x != u and x in targets:
+                remaining -= 1
+                if not remaining:
+                    break
+            h = hops[x] + 1
+            if h > self.hop_limit:
+                continue
+            for y, (w, _) in out[x].items():
+                if y == skip:
+                    continue
+                new_dist = d_x + w
+                if new_dist < dist.get(y, INF):
+                    dist[y] = new_dist
+                    hops[y] = h
+                    heapq.heappush(heap, (new_dist, y))
+        return dist
+
+    def shortcuts(self, v: int) -> List[Tuple[int, int, float]]:
+        """Shortcuts (u, w, weight) needed if v were contracted now."""
+        outs = self.out[v]
+        if not outs:
+            return []
+        max_out = max(w for w, _ in outs.values())
+        needed = []
+        for u, (w_uv, _) in self.inn[v].items():
+            dist = self.witness_distances(u, v, w_uv + max_out, outs)
+            for w, (w_vw, _) in outs.items():
+                if w == u:
+                    continue
+                via = w_uv + w_vw
+                if dist.get(w, INF) > via:
+                    needed.append((u, w, via))
+        return needed
+
+    def priority(self, v: int) -> int:
+        edge_difference = len(self.shortcuts(v)) - len(self.inn[v]) - len(self.out[v])
+        return edge_difference + self.deleted_neighbors[v]
+
+    def contract(self, v: int) -> Tuple[List[Tuple[int, float, int]], List[Tuple[int, float, int]]]:
+        """Contract v; returns its upward and downward hierarchy edges (the neighbours of v)."""
+        out, inn = self.out, self.inn
+        for u, w, via in self.shortcuts(v):
+            if via < out[u].get(w, (INF,))[0]:
+                out[u][w] = (via, v)
+                inn[w][u] = (via, v)
+
+        up = [(w, wt, m) for w, (wt, m) in out[v].items()]
+        down = [(u, wt, m) for u, (wt, m) in inn[v].items()]
+        for w in out[v]:
+            del inn[w][v]
+            self.deleted_neighbors[w] += 1
+        for u in inn[v]:
+            del out[u][v]
+            self.deleted_neighbors[u] += 1
+        out[v] = {}
+        inn[v] = {}
+        return up, down
+
+class ContractionHierarchy:
+    def __init__(self, rank: array, up: CSRGraph, up_middle: array,
+                 down: CSRGraph, down_middle: array) -> None:
+        self.rank = rank
+        self.up = up
+        self.up_middle = up_middle
+        self.down = down
+        self.down_middle = down_middle
+
+    @classmethod
+    def build(
+        cls,
+        graph: Union[CSRGraph, Graph],
+        hop_limit: int = WITNESS_HOP_LIMIT,
+        settle_limit: int = WITNESS_SETTLE_LIMIT,
+    ) -> "ContractionHierarchy":
+        graph = as_csr(graph)
+        n = graph.num_nodes
+        contractor = _Contractor(graph, hop_limit, settle_limit)
+
+        current = [contractor.priority(v) for v in range(n)]
+        heap = [(p, v) for v, p in enumerate(current)]
+        heapq.heapify(heap)
+        rank = array("q", [-1]) * n
+        up_edges: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        down_edges: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+
+        order = 0
+        while heap:
+            prio, v = heapq.heappop(heap)
+            if rank[v] >= 0 or prio != current[v]:
+                continue  # stale entry
+            # Lazy update: recompute and put v back if it is no longer the minimum
+            prio = contractor.priority(v)
+            if heap and prio > heap[0][0]:
+                current[v] = prio
+                heapq.heappush(heap, (prio, v))
+                continue
+            rank[v] = order
+            order += 1
+            up_edges[v], down_edges[v] = contractor.contract(v)
+            # Contracting v changes the edge difference of its neighbours
+            for w in {u for u, _, _ in up_edges[v]} | {u for u, _, _ in down_edges[v]}:
+                current[w] = contractor.priority(w)
+                heapq.heappush(heap, (current[w], w))
+
+        up, up_middle = _to_csr(up_edges, graph.node_ids, graph.node_index)
+        down, down_middle = _to_csr(down_edges, graph.node_ids, graph.node_index)
+        return cls(rank, up, up_middle, down, down_middle)
+
+    @property
+    def num_shortcuts(self) -> int:
+        return sum(m >= 0 for m in self.up_middle) + sum(m >= 0 for m in self.down_middle)
+
+    # Queries
+
+    def _search(self, s: int, t: int):
+        """Bidirectional upward search on dense IDs; returns (mu, meet, pred_f, pred_b)."""
+        graphs = (self.up, self.down)
+        dist: List[Dict[int, float]] = [{s: 0.0}, {t: 0.0}]
+        pred: List[Dict[int, int]] = [{s: -1}, {t: -1}]
+        heaps: List[List[Tuple[float, int]]] = [[(0.0, s)], [(0.0, t)]]
+        mu = 0.0 if s == t else INF
+        meet = s if s == t else -1
+        side = 0
+
+        while True:
+            # A direction is finished once its smallest key cannot improve mu
+            live = [i for i in (0, 1) if heaps[i] and heaps[i][0][0] < mu]
+            if not live:
+                break
+            if side not in live:
+                side = live[0]
+            heap, my_dist, my_pred = heaps[side], dist[side], pred[side]
+            other_dist = dist[1 - side]
+            d_u, u = heapq.heappop(heap)
+            if d_u <= my_dist[u]:
+                through = d_u + other_dist.get(u, INF)
+                if through < mu:
+                    mu, meet = through, u
+                # Stall-on-demand: if a higher node already reaches u more
+                # cheaply, u is not on a shortest up-path and need not be relaxed
+                g = graphs[1 - side]
+                offsets, targets, weights = g.offsets, g.targets, g.weights
+                stalled = False
+                for i in range(offsets[u], offsets[u + 1]):
+                    if my_dist.get(targets[i], INF) + weights[i] < d_u:
+                        stalled = True
+                        break
+                if stalled:
+                    side = 1 - side
+                    continue
+                g = graphs[side]
+                offsets, targets, weights = g.offsets, g.targets, g.weights
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    new_dist = d_u + weights[i]
+                    if new_dist < my_dist.get(v, INF):
+                        my_dist[v] = new_dist
+                        my_pred[v] = u
+                        heapq.heappush(heap, (new_dist, v))
+            side = 1 - side
+        return mu, meet, pred[0], pred[1]
+
+    def distance(self, source: Node, target: Node) -> float:
+        s, t = self.up.dense_id(source), self.up.dense_id(target)
+        return self._search(s, t)[0]
+
+    def query(self, source: Node, target: Node) -> Tuple[float, List[Node]]:
+        """Shortest path as (distance, path of original node IDs), or (inf, [])."""
+        s, t = self.up.dense_id(source), self.up.dense_id(target)
+        mu, meet, pred_f, pred_b = self._search(s, t)
+        if meet < 0:
+            return INF, []
+
+        hops = []  # hierarchy edges (a, b) from s to t
+        v = meet
+        while pred_f[v] >= 0:
+            hops.append((pred_f[v], v))
+            v = pred_f[v]
+        hops.reverse()
+        v = meet
+        while pred_b[v] >= 0:
+            hops.append((v, pred_b[v]))
+            v = pred_b[v]
+
+        ids = self.up.node_ids
+        path = [ids[s]]
+        for a, b in hops:
+            path.extend(ids[x] for x in self._unpack(a, b))
+        return mu, path
+
+    def _middle(self, a: int, b: int) -> int:
+        """Middle node of hierarchy edge a -> b, or -1 for an original edge."""
+        if self.rank[a] < self.rank[b]:
+            g, middle, u, x = self.up, self.up_middle, a, b
+        else:
+            g, middle, u, x = self.down, self.down_middle, b, a
+        for i in range(g.offsets[u], g.offsets[u + 1]):
+            if g.targets[i] == x:
+                return middle[i]
+        raise KeyError((a, b))
+
+    def _unpack(self, a: int, b: int) -> List[int]:
+        """Original-graph nodes after a on the path a -> b."""
+        nodes = []
+        stack = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            m = self._middle(x, y)
+            if m < 0:
+                nodes.append(y)
+            else:
+                stack.append((m, y))
+                stack.append((x, m))
+        return nodes
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        """Write the hierarchy; node IDs must be JSON-serializable if they are not 0..V-1."""
+        node_ids = self.up.node_ids
+        header = {
+            "magic": CH_FILE_MAGIC,
+            "num_nodes": self.up.num_nodes,
+            "num_up": self.up.num_edges,
+            "num_down": self.down.num_edges,
+            "node_ids": None if isinstance(node_ids, range) else list(node_ids),
+        }
+        tables = [self.rank,
+                  self.up.offsets, self.up.targets, self.up.weights, self.up_middle,
+                  self.down.offsets, self.down.targets, self.down.weights, self.down_middle]
+        if sys.byteorder != "little":
+            tables = [array(t.typecode, t) for t in tables]
+            for t in tables:
+                t.byteswap()
+        with open(path, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            for t in tables:
+                t.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("magic") != CH_FILE_MAGIC:
+                raise ValueError(f"{path} is not a contraction hierarchy file")
+            n, n_up, n_down = header["num_nodes"], header["num_up"], header["num_down"]
+            sizes = [("q", n),
+                     ("q", n + 1), ("q", n_up), ("d", n_up), ("q", n_up),
+                     ("q", n + 1), ("q", n_down), ("d", n_down), ("q", n_down)]
+            tables = []
+            for typecode, count in sizes:
+                t = array(typecode)
+                t.fromfile(f, count)
+                if sys.byteorder != "little":
+                    t.byteswap()
+                tables.append(t)
+
+        if header["node_ids"] is None:
+            node_ids: Sequence[Hashable] = range(n)
+            node_index = None
+        else:
+            # JSON turns tuple IDs into lists
+            node_ids = [tuple(x) if isinstance(x, list) else x for x in header["node_ids"]]
+            node_index = {u: i for i, u in enumerate(node_ids)}
+        rank = tables[0]
+        up = CSRGraph(tables[1], tables[2], tables[3], node_ids, node_index)
+        down = CSRGraph(tables[5], tables[6], tables[7], node_ids, node_index)
+        return cls(rank, up, tables[4], down, tables[8])
@@ -0,0 +1,211 @@
+# Dijkstras_CSR.py
+"""
+Compressed sparse row (CSR) graph representation and an array-backed Dijkstra.
+
+The dict-of-lists Graph costs a tuple object per edge and a dict lookup per
+node. CSRGraph stores the same graph in three flat arrays:
+
+    offsets: array('q'), length V + 1
+    targets: array('q'), length E    (dense target IDs)
+    weights: array('d'), length E
+
+so the out-edges of dense node u are targets[offsets[u]:offsets[u + 1]] with
+the matching weights, at 16 bytes per edge. Arbitrary hashable node IDs are
+remapped to dense IDs 0..V-1; when the graph already uses 0..V-1 the mapping
+is the identity and no index dict is kept.
+"""
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+import heapq
+
+Node = int
+Weight = float
+Graph = Dict[Node, List[Tuple[Node, Weight]]]
+
+INF = float("inf")
+
+class CSRGraph:
+    __slots__ = ("offsets", "targets", "weights", "node_ids", "node_index", "_reverse")
+
+    def __init__(
+        self,
+        offsets: array,
+        targets: array,
+        weights: array,
+        node_ids: Sequence[Hashable],
+        node_index: Optional[Dict[Hashable, int]] = None,
+    ) -> None:
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        # node_ids[i] is the original ID of dense node i. node_index is the
+        # inverse mapping, or None when node_ids is range(V).
+        self.node_ids = node_ids
+        self.node_index = node_index
+        self._reverse: Optional["CSRGraph"] = None
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "CSRGraph":
+        """Build a CSRGraph from a dict-of-lists Graph (nodes that only appear as targets are included)."""
+        node_ids: List[Hashable] = list(graph)
+        node_index: Dict[Hashable, int] = {u: i for i, u in enumerate(node_ids)}
+        for edges in graph.values():
+            for v, _ in edges:
+                if v not in node_index:
+                    node_index[v] = len(node_ids)
+                    node_ids.append(v)
+
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array("d")
+        for u in node_ids:
+            edges = graph.get(u, ())
+            targets.extend([node_index[v] for v, _ in edges])
+            weights.extend([w for _, w in edges])
+            offsets.append(len(targets))
+
+        n = len(node_ids)
+        if all(u == i for i, u in enumerate(node_ids)):
+            return cls(offsets, targets, weights, range(n))
+        return cls(offsets, targets, weights, node_ids, node_index)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def nbytes(self) -> int:
+        """Bytes used by the three CSR arrays."""
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.targets, self.weights))
+
+    def dense_id(self, node: Hashable) -> int:
+        """Dense ID of an original node ID. Raises KeyError for unknown nodes."""
+        if self.node_index is not None:
+            return self.node_index[node]
+        if isinstance(node, int) and 0 <= node < self.num_nodes:
+            return node
+        raise KeyError(node)
+
+    def neighbors(self, u: int) -> Iterator[Tuple[int, float]]:
+        """(dense target, weight) pairs for dense node u."""
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def reverse(self) -> "CSRGraph":
+        """The transposed graph (same dense IDs), built on first use and cached."""
+        if self._reverse is None:
+            n = self.num_nodes
+            offsets, targets, weights = self.offsets, self.targets, self.weights
+            counts = [0] * (n + 1)
+            for v in targets:
+                counts[v + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            r_offsets = array("q", counts)
+            fill = counts[:-1]
+            r_targets = array("q", bytes(8 * len(targets)))
+            r_weights = array("d", bytes(8 * len(weights)))
+            for u in range(n):
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    j = fill[v]
+                    r_targets[j] = u
+                    r_weights[j] = weights[i]
+                    fill[v] = j + 1
+            rev = CSRGraph(r_offsets, r_targets, r_weights, self.node_ids, self.node_index)
+            rev._reverse = self
+            self._reverse = rev
+        return self._reverse
+
+    def to_graph(self) -> Graph:
+        """Convert back to a dict-of-lists Graph with the original node IDs."""
+        ids = self.node_ids
+        return {
+            ids[u]: [(ids[v], w) for v, w in self.neighbors(u)]
+            for u in range(self.num_nodes)
+        }
+
+    def to_numpy(self):
+        """Zero-copy NumPy views (offsets, targets, weights) of the CSR arrays."""
+        import numpy as np
+
+        return (
+            np.frombuffer(self.offsets, dtype=np.int64),
+            np.frombuffer(self.targets, dtype=np.int64),
+            np.frombuffer(self.weights, dtype=np.float64),
+        )
+
+def as_csr(graph: Union[CSRGraph, Graph]) -> CSRGraph:
+    return graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+
+class DistanceView(Mapping):
+    """
+    Read-only dict-compatible view of a dense distance array.
+
+    Keys are original node IDs. Unreachable nodes (distance inf) are not in
+    the view; some Round implementations include them with distance inf, so
+    compare through a lookup with an inf default. The dense array itself is
+    available as .array.
+    """
+    __slots__ = ("array", "graph")
+
+    def __init__(self, dist: array, graph: CSRGraph) -> None:
+        self.array = dist
+        self.graph = graph
+
+    def __getitem__(self, node: Hashable) -> float:
+        d = self.array[self.graph.dense_id(node)]
+        if d == INF:
+            raise KeyError(node)
+        return d
+
+    def __iter__(self) -> Iterator[Hashable]:
+        ids = self.graph.node_ids
+        return (ids[u] for u, d in enumerate(self.array) if d != INF)
+
+    def __len__(self) -> int:
+        return len(self.array) - self.array.count(INF)
+
+    def __repr__(self) -> str:
+        return f"DistanceView({dict(self.items())!r})"
+
+def dijkstra_csr(graph: Union[CSRGraph, Graph], source: Node, pred: Optional[array] = None) -> DistanceView:
+    """
+    Compute the shortest path distance from `source` to every reachable node.
+
+    `graph` is a CSRGraph (a dict-of-lists Graph is converted first). The
+    relaxation loop indexes the flat arrays directly, so no per-edge tuples
+    are created. Returns a DistanceView over a dense array('d') of distances.
+
+    If `pred` is given it must be an array('q') of V entries set to -1. Every
+    improving relaxation writes the dense predecessor of the relaxed node
+    into it, so it ends up holding the shortest-path tree (see
+    Dijkstras_Paths). The other engines take the same argument.
+    """
+    graph = as_csr(graph)
+    s = graph.dense_id(source)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    dist = array("d", [INF]) * graph.num_nodes
+    dist[s] = 0.0
+    heap = [(0.0, s)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    while heap:
+        d_u, u = heappop(heap)
+        if d_u > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_dist = d_u + weights[i]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                if pred is not None:
+                    pred[v] = u
+                heappush(heap, (new_dist, v))
+
+    return DistanceView(dist, graph)
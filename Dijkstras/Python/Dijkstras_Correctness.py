@@ -4,16 +4,25 @@ Correctness test harness for Python Dijkstra algorithms.
 
 Assumes each algorithm is a function:
     def dijkstra(graph: Graph, source: Node) -> Dict[Node, float]:
+
+Each case is generated from its own seed, and reference distances come from
+the on-disk reference cache (see Dijkstras_ReferenceCache.py). networkx is
+only imported when a reference is not cached yet.
 """
 import math
 import random
-import networkx as nx
 from typing import Dict, List, Tuple
 
+from Dijkstras_ReferenceCache import ReferenceCache
+
 from Dijkstras_ChatGPT import dijkstra as dijkstra_chatgpt
 from Dijkstras_DeepSeek import dijkstra as dijkstra_deepseek
 from Dijkstras_Claude import dijkstra as dijkstra_claude
 from Dijkstras_Gemini import dijkstra as dijkstra_gemini
+from Dijkstras_BellmanFord import bellman_ford
+from Dijkstras_CSR import dijkstra_csr
+from Dijkstras_Dense import dijkstra_auto
+from Dijkstras_ResultCache import SSSPCache
 
 Node = int
 Weight = float
@@ -24,6 +33,9 @@ ALGORITHMS = {
     "deepseek_py": dijkstra_deepseek,
     "claude_py": dijkstra_claude,
     "gemini_py": dijkstra_gemini,
+    "csr_py": dijkstra_csr,
+    "auto_py": dijkstra_auto,
+    "bf_py": bellman_ford,
 }
 
 def gen_random_graph(num_nodes: int, edge_prob: float) -> Graph:
@@ -38,6 +50,8 @@ def gen_random_graph(num_nodes: int, edge_prob: float) -> Graph:
     return g
 
 def nx_dijkstra_reference(graph: Graph, source: int) -> Dict[int, float]:
+    import networkx as nx
+
     G = nx.DiGraph()
     for u, edges in graph.items():
         for v, w in edges:
@@ -50,9 +64,25 @@ def nx_dijkstra_reference(graph: Graph, source: int) -> Dict[int, float]:
 def normalize(dist: Dict[int, float], nodes) -> Dict[int, float]:
     return {u: dist.get(u, math.inf) for u in nodes}
 
-def test_one_algorithm(name: str, algo):
-    random.seed(1) # for reproducibility
-    
+REFERENCE_CACHE_DIR = "reference_cache"
+
+def gen_case(num_nodes: int, edge_prob: float, seed: int) -> Tuple[Graph, Node]:
+    """Generate one (graph, source) case from its own seed."""
+    random.seed(f"gen_random_graph:{num_nodes}:{edge_prob}:{seed}")
+    g = gen_random_graph(num_nodes, edge_prob)
+    return g, random.randrange(num_nodes)
+
+def cached_reference(cache: ReferenceCache, graph: Graph, source: Node,
+                     num_nodes: int, edge_prob: float, seed: int):
+    """Reference distances for a gen_case() case, indexed by node (inf if unreachable)."""
+    def compute():
+        ref = nx_dijkstra_reference(graph, source)
+        return [ref.get(u, math.inf) for u in range(num_nodes)]
+
+    params = {"num_nodes": num_nodes, "edge_prob": edge_prob}
+    return cache.get_or_compute("gen_random_graph", params, seed, compute)
+
+def test_one_algorithm(name: str, algo, cache: ReferenceCache):
     # test 100 times with graphs of 20 nodes with each edge having a 20% chance of existing
     NUM_TESTS = 100
     N = 20
@@ -61,20 +91,18 @@ def test_one_algorithm(name: str, algo):
     failures = 0
     exceptions = 0
 
-    for _ in range(NUM_TESTS):
-        g = gen_random_graph(N, EDGE_PROB)
+    for seed in range(NUM_TESTS):
+        g, source = gen_case(N, EDGE_PROB, seed)
         nodes = list(g.keys())
-        source = random.randrange(N)
 
         try:
-            ref = nx_dijkstra_reference(g, source)
+            ref = cached_reference(cache, g, source, N, EDGE_PROB, seed)
             got = algo(g, source)
 
-            ref_norm = normalize(ref, nodes)
             got_norm = normalize(got, nodes)
 
             for u in nodes:
-                if not math.isclose(ref_norm[u], got_norm[u],
+                if not math.isclose(ref[u], got_norm[u],
                                     rel_tol=1e-9, abs_tol=1e-9):
                     failures += 1
                     break
@@ -83,6 +111,23 @@ def test_one_algorithm(name: str, algo):
 
     print(f"{name}: failures={failures}, exceptions={exceptions}")
 
+def test_result_cache():
+    """Cached results must match a fresh search, including graphs that only differ in node order."""
+    cache = SSSPCache()
+    cases = [
+        ({0: [(1, 1.0)], 1: []}, 0),
+        ({1: [(0, 1.0)], 0: []}, 0),  # same dense CSR arrays as above, other node IDs
+        ({0: [(1, 1.0)], 1: []}, 0),  # a hit on the first entry
+    ]
+    failures = 0
+    for g, source in cases:
+        if dict(cache.get(g, source)) != dict(dijkstra_csr(g, source)):
+            failures += 1
+    print(f"result_cache: failures={failures}, hits={cache.hits}")
+
 if __name__ == "__main__":
+    cache = ReferenceCache(REFERENCE_CACHE_DIR)
     for name, algo in ALGORITHMS.items():
-        test_one_algorithm(name, algo)
+        test_one_algorithm(name, algo, cache)
+    test_result_cache()
+    print(f"Reference cache: hits={cache.hits}, misses={cache.misses}")
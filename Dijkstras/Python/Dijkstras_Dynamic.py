@@ -0,0 +1,200 @@
+# Dijkstras_Dynamic.py
+"""
+Dynamic single-source shortest paths under edge updates.
+
+A DynamicGraph keeps mutable adjacency maps, out[u][v] = w and in_[v][u] = w.
+Parallel edges are collapsed to the lightest one, so an edge is identified
+by its (u, v) pair. add_source() attaches a ShortestPathTree for a source:
+distances, predecessors and child sets. Every later update() repairs each
+attached tree instead of recomputing it. The repair follows Ramalingam and
+Reps:
+
+    increase / delete of a tree edge (pred[v] == u)
+        Only the subtree under v can get longer. Its nodes are reset, each
+        is seeded with its best in-edge from outside the subtree, and a
+        Dijkstra restricted to improvements settles them again.
+    decrease / insert of (u, v)
+        If d[u] + w < d[v], v is seeded with the new distance and the
+        improvement is propagated Dijkstra-style.
+    increase / delete of a non-tree edge
+        Nothing to do.
+
+A batch of updates is applied to the graph first. The trees are then
+repaired with a single propagation that combines all reset subtrees and all
+improved seeds. The work is proportional to the nodes whose distance or
+predecessor changes and their edges, not to the size of the graph.
+
+Nodes are fixed when the DynamicGraph is built; updates may only add or
+remove edges between existing nodes.
+"""
+from array import array
+from typing import Dict, Hashable, Iterable, List, Set, Tuple, Union
+import heapq
+
+from Dijkstras_CSR import INF, CSRGraph, DistanceView, Graph, Node, as_csr
+
+# One update: ("set", u, v, w) inserts the edge or changes its weight,
+# ("delete", u, v) removes it
+Update = Tuple
+
+class ShortestPathTree:
+    """Distances and shortest-path tree from one source; maintained by its DynamicGraph."""
+
+    def __init__(self, graph: "DynamicGraph", source: Node) -> None:
+        self.graph = graph
+        n = graph.csr.num_nodes
+        self.source = graph.csr.dense_id(source)
+        self.dist = array("d", [INF]) * n
+        self.pred = array("q", [-1]) * n
+        self.children: List[Set[int]] = [set() for _ in range(n)]
+        self.dist[self.source] = 0.0
+        self._propagate([(0.0, self.source)])
+
+    def _set_pred(self, v: int, u: int) -> None:
+        old = self.pred[v]
+        if old >= 0:
+            self.children[old].discard(v)
+        self.pred[v] = u
+        if u >= 0:
+            self.children[u].add(v)
+
+    def _propagate(self, heap: List[Tuple[float, int]]) -> int:
+        """Dijkstra from the seeded heap, following improvements only. Returns settled count."""
+        out, dist = self.graph.out, self.dist
+        heapq.heapify(heap)
+        heappop, heappush = heapq.heappop, heapq.heappush
+        settled = 0
+        while heap:
+            d_u, u = heappop(heap)
+            if d_u > dist[u]:
+                continue
+            settled += 1
+            for v, w in out[u].items():
+                new_dist = d_u + w
+                if new_dist < dist[v]:
+                    dist[v] = new_dist
+                    self._set_pred(v, u)
+                    heappush(heap, (new_dist, v))
+        return settled
+
+    def _subtree(self, root: int) -> List[int]:
+        nodes = [root]
+        children = self.children
+        for u in nodes:
+            nodes.extend(children[u])
+        return nodes
+
+    def _repair(self, changes: List[Tuple[int, int, float, float]]) -> int:
+        """Repair after edge changes (u, v, old weight, new weight; inf = absent)."""
+        dist, pred = self.dist, self.pred
+        affected: Set[int] = set()
+        for u, v, old, new in changes:
+            if new > old and pred[v] == u and v not in affected:
+                affected.update(self._subtree(v))
+
+        heap: List[Tuple[float, int]] = []
+        for v in affected:
+            dist[v] = INF
+            self._set_pred(v, -1)
+        in_ = self.graph.in_
+        for v in affected:
+            best, best_u = INF, -1
+            for u, w in in_[v].items():
+                if u not in affected and dist[u] + w < best:
+                    best, best_u = dist[u] + w, u
+            if best_u >= 0:
+                dist[v] = best
+                self._set_pred(v, best_u)
+                heap.append((best, v))
+
+        for u, v, old, new in changes:
+            if new < old and dist[u] + new < dist[v]:
+                dist[v] = dist[u] + new
+                self._set_pred(v, u)
+                heap.append((dist[v], v))
+        return len(affected) + self._propagate(heap)
+
+    # Results
+
+    def distance(self, node: Node) -> float:
+        return self.dist[self.graph.csr.dense_id(node)]
+
+    def path(self, node: Node) -> List[Hashable]:
+        """Shortest path from the source to node, or [] if it is unreachable."""
+        v = self.graph.csr.dense_id(node)
+        if self.dist[v] == INF:
+            return []
+        nodes = []
+        while v >= 0:
+            nodes.append(v)
+            v = self.pred[v]
+        ids = self.graph.csr.node_ids
+        return [ids[u] for u in reversed(nodes)]
+
+    def distances(self) -> DistanceView:
+        """Live dict-compatible view of the current distances."""
+        return DistanceView(self.dist, self.graph.csr)
+
+class DynamicGraph:
+    def __init__(self, graph: Union[CSRGraph, Graph]) -> None:
+        # csr only supplies the node ID mapping; edges live in out / in_
+        self.csr = as_csr(graph)
+        n = self.csr.num_nodes
+        offsets, targets, weights = self.csr.offsets, self.csr.targets, self.csr.weights
+        self.out: List[Dict[int, float]] = [{} for _ in range(n)]
+        self.in_: List[Dict[int, float]] = [{} for _ in range(n)]
+        for u in range(n):
+            out_u = self.out[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v, w = targets[i], weights[i]
+                if w < out_u.get(v, INF):
+                    out_u[v] = w
+                    self.in_[v][u] = w
+        self.trees: List[ShortestPathTree] = []
+
+    def add_source(self, source: Node) -> ShortestPathTree:
+        """Compute and attach a shortest-path tree that update() keeps current."""
+        tree = ShortestPathTree(self, source)
+        self.trees.append(tree)
+        return tree
+
+    def remove_source(self, tree: ShortestPathTree) -> None:
+        self.trees.remove(tree)
+
+    def update(self, updates: Iterable[Update]) -> int:
+        """
+        Apply a batch of ("set", u, v, w) / ("delete", u, v) updates and repair
+        every attached tree. Returns the number of nodes the repairs touched.
+        """
+        dense_id = self.csr.dense_id
+        first_weight: Dict[Tuple[int, int], float] = {}  # weight of each edge before the batch
+        for update in updates:
+            op, u, v = update[0], dense_id(update[1]), dense_id(update[2])
+            first_weight.setdefault((u, v), self.out[u].get(v, INF))
+            if op == "set":
+                w = float(update[3])
+                if w < 0:
+                    raise ValueError("Dijkstra's algorithm requires non-negative edge weights")
+                self.out[u][v] = w
+                self.in_[v][u] = w
+            elif op == "delete":
+                self.out[u].pop(v, None)
+                self.in_[v].pop(u, None)
+            else:
+                raise ValueError(f"unknown update {op!r}")
+        changes = [(u, v, old, self.out[u].get(v, INF))
+                   for (u, v), old in first_weight.items() if self.out[u].get(v, INF) != old]
+        if not changes:
+            return 0
+        return sum(tree._repair(changes) for tree in self.trees)
+
+    def set_weight(self, u: Node, v: Node, w: float) -> int:
+        return self.update([("set", u, v, w)])
+
+    def delete_edge(self, u: Node, v: Node) -> int:
+        return self.update([("delete", u, v)])
+
+    def to_graph(self) -> Dict[Hashable, List[Tuple[Hashable, float]]]:
+        """Current edges as a dict-of-lists Graph, e.g. for a full recomputation."""
+        ids = self.csr.node_ids
+        return {ids[u]: [(ids[v], w) for v, w in edges.items()] for u, edges in enumerate(self.out)}
@@ -0,0 +1,232 @@
+# Dijkstras_Frozen.py
+"""
+Validated, immutable graph with cached statistics and engine selection.
+
+The Round implementations learn nothing about a graph between calls, and
+Dijkstras_ChatGPT.py checks `w < 0` on every relaxation. A FrozenGraph
+converts a graph to CSR once and computes its facts lazily, on first use,
+caching each one:
+
+    weight_stats()        min/max weight, integral, binary (one pass over the edges)
+    density               E / V^2
+    dense_ids             whether node IDs are already 0..V-1
+    topological_order     Kahn's algorithm; None if the graph has a cycle
+    components            weakly connected component ID per node (union-find)
+
+dijkstra() dispatches on those facts once per graph, in this order:
+
+    "dag"       acyclic: one relaxation pass in topological order, O(V + E),
+                and negative weights are fine
+    "bellman_ford"  negative weights with a cycle: Dijkstras_BellmanFord
+    "01bfs" / "dial" / "radix"  small or integer weights: Dijkstras_Buckets
+    "dense"     E / V^2 above DENSE_THRESHOLD: Dijkstras_Dense
+    "heap"      everything else: the CSR lazy-heap engine
+
+No engine re-checks weights per edge. distance(s, t) answers inf at once
+when s and t lie in different weakly connected components.
+"""
+from array import array
+from typing import Dict, Optional, Union
+
+from Dijkstras_BellmanFord import bellman_ford
+from Dijkstras_Buckets import BUCKET_ENGINES, choose_bucket_engine, weight_stats
+from Dijkstras_CSR import INF, CSRGraph, DistanceView, Graph, Node, as_csr, dijkstra_csr
+from Dijkstras_Dense import DENSE_THRESHOLD, DenseGraph, dijkstra_dense
+from Dijkstras_PQ import dijkstra_pq
+
+class FrozenGraph:
+    def __init__(self, graph: Union[CSRGraph, Graph]) -> None:
+        self._csr = as_csr(graph)
+        self._weight_stats: Optional[Dict[str, object]] = None
+        self._topological_order: Optional[array] = None
+        self._is_dag: Optional[bool] = None  # None until the topological sort has run
+        self._components: Optional[array] = None
+        self._num_components = 0
+        self._engine: Optional[str] = None
+        self._dense: Optional[DenseGraph] = None
+
+    @property
+    def csr(self) -> CSRGraph:
+        return self._csr
+
+    @property
+    def num_nodes(self) -> int:
+        return self.csr.num_nodes
+
+    @property
+    def num_edges(self) -> int:
+        return self.csr.num_edges
+
+    # Cached facts
+
+    def weight_stats(self) -> Dict[str, object]:
+        if self._weight_stats is None:
+            self._weight_stats = weight_stats(self.csr)
+        return self._weight_stats
+
+    @property
+    def non_negative(self) -> bool:
+        return self.weight_stats()["min"] >= 0
+
+    @property
+    def integral(self) -> bool:
+        return self.weight_stats()["integral"]
+
+    @property
+    def max_weight(self) -> float:
+        return self.weight_stats()["max"]
+
+    @property
+    def density(self) -> float:
+        n = self.num_nodes
+        return self.num_edges / (n * n) if n else 0.0
+
+    @property
+    def dense_ids(self) -> bool:
+        return self.csr.node_index is None
+
+    @property
+    def topological_order(self) -> Optional[array]:
+        """Dense nodes in topological order, or None if the graph has a cycle."""
+        if self._is_dag is None:
+            csr = self.csr
+            n = csr.num_nodes
+            offsets, targets = csr.offsets, csr.targets
+            indegree = array("q", bytes(8 * n))
+            for v in targets:
+                indegree[v] += 1
+            order = array("q", [u for u in range(n) if not indegree[u]])
+            i = 0
+            while i < len(order):
+                u = order[i]
+                i += 1
+                for j in range(offsets[u], offsets[u + 1]):
+                    v = targets[j]
+                    indegree[v] -= 1
+                    if not indegree[v]:
+                        order.append(v)
+            self._is_dag = len(order) == n
+            self._topological_order = order if self._is_dag else None
+        return self._topological_order
+
+    @property
+    def is_dag(self) -> bool:
+        return self.topological_order is not None
+
+    @property
+    def components(self) -> array:
+        """Weakly connected component ID (0..k-1) of every dense node."""
+        if self._components is None:
+            self._find_components()
+        return self._components
+
+    @property
+    def num_components(self) -> int:
+        if self._components is None:
+            self._find_components()
+        return self._num_components
+
+    def _find_components(self) -> None:
+        csr = self.csr
+        n = csr.num_nodes
+        parent = array("q", range(n))
+
+        def find(x: int) -> int:
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        offsets, targets = csr.offsets, csr.targets
+        for u in range(n):
+            for j in range(offsets[u], offsets[u + 1]):
+                a, b = find(u), find(targets[j])
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+        ids: Dict[int, int] = {}
+        comp = array("q", bytes(8 * n))
+        for u in range(n):
+            comp[u] = ids.setdefault(find(u), len(ids))
+        self._components = comp
+        self._num_components = len(ids)
+
+    # Engine selection
+
+    @property
+    def engine(self) -> str:
+        if self._engine is None:
+            if self.is_dag:
+                engine = "dag"
+            elif not self.non_negative:
+                engine = "bellman_ford"
+            else:
+                engine = choose_bucket_engine(self.weight_stats())
+                if engine == "heap" and self.density > DENSE_THRESHOLD:
+                    engine = "dense"
+            self._engine = engine
+        return self._engine
+
+    def dijkstra(self, source: Node, pred: Optional[array] = None) -> DistanceView:
+        """Distances from source with the engine chosen for this graph; pred as in dijkstra_csr()."""
+        engine = self.engine
+        csr = self.csr
+        if engine == "dag":
+            return dijkstra_dag(self, source, pred)
+        if engine == "bellman_ford":
+            return bellman_ford(csr, source, pred=pred)
+        if engine == "dense":
+            if self._dense is None:
+                self._dense = DenseGraph.from_graph(csr)
+            return dijkstra_dense(self._dense, source, pred)
+        if engine == "heap":
+            return dijkstra_csr(csr, source, pred)
+        return BUCKET_ENGINES[engine](csr, source, pred=pred)
+
+    def distance(self, source: Node, target: Node) -> float:
+        """Shortest source-target distance; inf without a search across components."""
+        csr = self.csr
+        s, t = csr.dense_id(source), csr.dense_id(target)
+        if self.components[s] != self.components[t]:
+            return INF
+        if self.engine == "dag":
+            return dijkstra_dag(self, source).array[t]
+        if self.engine == "bellman_ford":
+            return bellman_ford(csr, source).array[t]
+        return dijkstra_pq(csr, source, targets=[target]).array[t]
+
+def dijkstra_dag(graph: FrozenGraph, source: Node, pred: Optional[array] = None) -> DistanceView:
+    """Relax edges in topological order, starting at source; the graph must be acyclic."""
+    order = graph.topological_order
+    if order is None:
+        raise ValueError("graph has a cycle")
+    csr = graph.csr
+    s = csr.dense_id(source)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    dist = array("d", [INF]) * csr.num_nodes
+    dist[s] = 0.0
+    started = False
+    for u in order:
+        if u == s:
+            started = True
+        if not started:
+            continue  # nothing before the source in topological order is reachable from it
+        d_u = dist[u]
+        if d_u == INF:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_dist = d_u + weights[i]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                if pred is not None:
+                    pred[v] = u
+    return DistanceView(dist, csr)
+
+def dijkstra(graph: Union[FrozenGraph, CSRGraph, Graph], source: Node,
+             pred: Optional[array] = None) -> DistanceView:
+    """Front door: freeze the graph if needed and run the engine it allows."""
+    if not isinstance(graph, FrozenGraph):
+        graph = FrozenGraph(graph)
+    return graph.dijkstra(source, pred)
@@ -0,0 +1,233 @@
+# Dijkstras_GraphStore.py
+"""
+Mutable graph store: a frozen CSR base plus an append-only delta log.
+
+Updates use the DynamicGraph format: ("set", u, v, w) inserts or reweights
+the edge u -> v, and ("delete", u, v) removes it. Both apply to every
+parallel base edge u -> v. Updates are appended to a log together with a
+per-node index of log positions. Queries merge base and log on the fly. A
+node with no log entries is read straight from its CSR slice. A node with
+entries gets its base edges overlaid with the latest set/delete per target.
+
+Readers never take a lock. snapshot() captures the current state and the
+log length at that moment. The log is append-only and entries past that
+length are ignored, so a snapshot is immutable even while writers keep
+appending.
+
+Once the log grows past compact_threshold, a background thread folds a
+snapshot into a new CSR. A short critical section then publishes a new
+state: the new base plus the log entries written in the meantime. Snapshots
+taken before the swap keep the old state alive until they are dropped.
+
+The node set is fixed by the base graph.
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import heapq
+import itertools
+import threading
+
+from Dijkstras_CSR import INF, CSRGraph, DistanceView, Graph, Node, as_csr, dijkstra_csr
+from Dijkstras_Dynamic import Update
+
+COMPACT_THRESHOLD = 4096  # log entries that trigger a background compaction
+
+LogEntry = Tuple[int, int, Optional[float]]  # (u, v, weight), weight None for a delete
+
+_store_ids = itertools.count(1)
+
+class _State:
+    __slots__ = ("store_id", "base", "log", "index", "base_version")
+
+    def __init__(self, store_id: int, base: CSRGraph, log: List[LogEntry], base_version: int) -> None:
+        self.store_id = store_id
+        self.base = base
+        self.log = log
+        self.index: Dict[int, List[int]] = {}  # u -> positions of u's entries in log
+        for pos, (u, _, _) in enumerate(log):
+            self.index.setdefault(u, []).append(pos)
+        self.base_version = base_version
+
+class Snapshot:
+    """Read-only view of the store at one version."""
+    __slots__ = ("store_id", "base", "log", "index", "length", "version")
+
+    def __init__(self, state: _State) -> None:
+        self.store_id = state.store_id  # unique per GraphStore, never reused
+        self.base = state.base
+        self.log = state.log
+        self.index = state.index
+        self.length = len(state.log)
+        self.version = state.base_version + self.length
+
+    @property
+    def num_nodes(self) -> int:
+        return self.base.num_nodes
+
+    @property
+    def node_ids(self):
+        return self.base.node_ids
+
+    def dense_id(self, node: Node) -> int:
+        return self.base.dense_id(node)
+
+    def changes(self, u: int) -> Optional[Dict[int, Optional[float]]]:
+        """Latest logged weight per target of dense node u (None = deleted), or None if u is unchanged."""
+        positions = self.index.get(u)
+        if positions is None or positions[0] >= self.length:
+            return None
+        latest: Dict[int, Optional[float]] = {}
+        log, length = self.log, self.length
+        for pos in positions:
+            if pos >= length:
+                break
+            _, v, w = log[pos]
+            latest[v] = w
+        return latest
+
+    def neighbors(self, u: int) -> Iterator[Tuple[int, float]]:
+        """(target, weight) out of dense node u, base and log merged."""
+        base = self.base
+        start, end = base.offsets[u], base.offsets[u + 1]
+        latest = self.changes(u)
+        if latest is None:
+            return zip(base.targets[start:end], base.weights[start:end])
+        return self._merged(base, start, end, latest)
+
+    @staticmethod
+    def _merged(base: CSRGraph, start: int, end: int,
+                latest: Dict[int, Optional[float]]) -> Iterator[Tuple[int, float]]:
+        targets, weights = base.targets, base.weights
+        for i in range(start, end):
+            if targets[i] not in latest:
+                yield targets[i], weights[i]
+        for v, w in latest.items():
+            if w is not None:
+                yield v, w
+
+    def to_csr(self) -> CSRGraph:
+        """Materialize the merged graph as a new CSRGraph."""
+        base = self.base
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array("d")
+        for u in range(base.num_nodes):
+            for v, w in self.neighbors(u):
+                targets.append(v)
+                weights.append(w)
+            offsets.append(len(targets))
+        return CSRGraph(offsets, targets, weights, base.node_ids, base.node_index)
+
+class GraphStore:
+    def __init__(self, graph: Union[CSRGraph, Graph], compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        self.compact_threshold = compact_threshold
+        self.compactions = 0
+        self._state = _State(next(_store_ids), as_csr(graph), [], 0)
+        self._write_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        """Number of updates applied since the store was created."""
+        state = self._state
+        return state.base_version + len(state.log)
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(self._state)
+
+    def update(self, updates: Iterable[Update]) -> int:
+        """Append a batch of updates; returns the new version."""
+        with self._write_lock:
+            state = self._state
+            dense_id = state.base.dense_id
+            entries: List[LogEntry] = []
+            for update in updates:
+                op, u, v = update[0], dense_id(update[1]), dense_id(update[2])
+                if op == "set":
+                    w = float(update[3])
+                    if w < 0:
+                        raise ValueError("Dijkstra's algorithm requires non-negative edge weights")
+                    entries.append((u, v, w))
+                elif op == "delete":
+                    entries.append((u, v, None))
+                else:
+                    raise ValueError(f"unknown update {op!r}")
+            # Index first, then log: a reader that sees a new position also sees it
+            # is past its snapshot length and ignores it
+            log, index = state.log, state.index
+            for pos, (u, _, _) in enumerate(entries, len(log)):
+                positions = index.get(u)
+                if positions is None:
+                    index[u] = [pos]
+                else:
+                    positions.append(pos)
+            log.extend(entries)
+            version = state.base_version + len(log)
+            if len(log) >= self.compact_threshold and self._compactor is None:
+                self._compactor = threading.Thread(target=self._compact, daemon=True)
+                self._compactor.start()
+        return version
+
+    def set_weight(self, u: Node, v: Node, w: float) -> int:
+        return self.update([("set", u, v, w)])
+
+    def delete_edge(self, u: Node, v: Node) -> int:
+        return self.update([("delete", u, v)])
+
+    def compact(self) -> None:
+        """Fold the current log into a new CSR base now, waiting for any background compaction first."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        self._compact()
+
+    def _compact(self) -> None:
+        try:
+            snap = self.snapshot()
+            base = snap.to_csr()  # the slow part runs without the lock
+            with self._write_lock:
+                state = self._state
+                if state.log is snap.log:
+                    tail = state.log[snap.length:]
+                    self._state = _State(state.store_id, base, tail, snap.version)
+                    self.compactions += 1
+        finally:
+            if threading.current_thread() is self._compactor:
+                self._compactor = None
+
+def dijkstra_store(graph: Union[GraphStore, Snapshot], source: Node,
+                   pred: Optional[array] = None) -> DistanceView:
+    """
+    Compute the shortest path distance from `source` to every reachable node
+    of a store (its current snapshot) or of a snapshot. `pred` records the
+    shortest-path tree as in dijkstra_csr().
+    """
+    snap = graph.snapshot() if isinstance(graph, GraphStore) else graph
+    base = snap.base
+    if not snap.length:
+        return dijkstra_csr(base, source, pred)
+    s = base.dense_id(source)
+    offsets, edge_targets, weights = base.offsets, base.targets, base.weights
+    changes = snap.changes
+
+    dist = array("d", [INF]) * base.num_nodes
+    dist[s] = 0.0
+    heap = [(0.0, s)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    while heap:
+        d_u, u = heappop(heap)
+        if d_u > dist[u]:
+            continue
+        latest = changes(u)
+        if latest is None:
+            edges = zip(edge_targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]])
+        else:
+            edges = Snapshot._merged(base, offsets[u], offsets[u + 1], latest)
+        for v, w in edges:
+            new_dist = d_u + w
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                if pred is not None:
+                    pred[v] = u
+                heappush(heap, (new_dist, v))
+    return DistanceView(dist, base)
@@ -0,0 +1,192 @@
+# Dijkstras_HubLabels.py
+"""
+2-hop hub labeling distance oracle built from a contraction hierarchy.
+
+Every node v gets a forward label Lf(v) and a backward label Lb(v): sorted
+lists of (hub, distance) pairs such that for every pair s, t some hub on a
+shortest s-t path appears in both Lf(s) and Lb(t). Then
+
+    d(s, t) = min over common hubs h of Lf(s)[h] + Lb(t)[h]
+
+which is a linear merge of two sorted arrays, with no graph search at all.
+
+Labels come from the hierarchy. Lf(v) is v itself plus the labels of v's
+upward neighbours, and Lb(v) is built the same way from the downward edges.
+Entries whose distance is longer than the true distance are pruned.
+
+All labels live in flat arrays (offsets, hubs as ranks, distances). save()
+writes them to a single file and load() memory-maps it, so many processes
+can share one index through the page cache.
+"""
+from array import array
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+import json
+import mmap
+import struct
+import sys
+
+from Dijkstras_CH import ContractionHierarchy
+from Dijkstras_CSR import INF, CSRGraph, Graph, Node
+
+HUB_FILE_MAGIC = b"HUBLBL01"
+HUB_HEADER = struct.Struct("<8sqqqqq")  # magic, V, forward entries, backward entries, ids offset, ids length
+HUB_HEADER_SIZE = 64  # header is padded so every array starts 8-byte aligned
+
+def _labels_from_hierarchy(ch: ContractionHierarchy, g: CSRGraph) -> List[Dict[int, float]]:
+    """Labels over the edges of g (ch.up or ch.down), keyed by hub rank."""
+    rank = ch.rank
+    n = g.num_nodes
+    labels: List[Dict[int, float]] = [{} for _ in range(n)]
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    for v in sorted(range(n), key=rank.__getitem__, reverse=True):
+        label = {rank[v]: 0.0}
+        for i in range(offsets[v], offsets[v + 1]):
+            w = weights[i]
+            for h, d in labels[targets[i]].items():
+                d += w
+                if d < label.get(h, INF):
+                    label[h] = d
+        labels[v] = label
+    return labels
+
+def _prune(labels: List[Dict[int, float]], other: List[Dict[int, float]],
+           by_rank: Sequence[int], forward: bool) -> None:
+    """Drop entries (h, d) of labels[v] when the labels already prove a shorter v-h distance."""
+    for v, label in enumerate(labels):
+        for h, d in list(label.items()):
+            other_label = other[by_rank[h]]
+            if forward:
+                best = min((d1 + other_label[x] for x, d1 in label.items() if x in other_label), default=INF)
+            else:
+                best = min((d1 + label[x] for x, d1 in other_label.items() if x in label), default=INF)
+            if best < d:
+                del label[h]
+
+def _pack(labels: List[Dict[int, float]]) -> Tuple[array, array, array]:
+    offsets = array("q", [0])
+    hubs = array("q")
+    dists = array("d")
+    for label in labels:
+        for h in sorted(label):
+            hubs.append(h)
+            dists.append(label[h])
+        offsets.append(len(hubs))
+    return offsets, hubs, dists
+
+class HubLabels:
+    def __init__(self, fwd: Tuple, bwd: Tuple, node_ids: Sequence[Hashable],
+                 node_index: Optional[Dict[Hashable, int]] = None) -> None:
+        # Each of fwd/bwd is (offsets, hubs, dists): array or memoryview of the same typecodes
+        self.fwd_offsets, self.fwd_hubs, self.fwd_dists = fwd
+        self.bwd_offsets, self.bwd_hubs, self.bwd_dists = bwd
+        self.node_ids = node_ids
+        self.node_index = node_index
+        self._mmap: Optional[mmap.mmap] = None
+
+    @classmethod
+    def from_ch(cls, ch: ContractionHierarchy) -> "HubLabels":
+        fwd = _labels_from_hierarchy(ch, ch.up)
+        bwd = _labels_from_hierarchy(ch, ch.down)
+        by_rank = array("q", bytes(8 * len(ch.rank)))
+        for v, r in enumerate(ch.rank):
+            by_rank[r] = v
+        # Forward entries are checked against the complete backward labels; backward
+        # entries are then checked against the already pruned forward labels, which
+        # still hold every exact entry, so some non-exact backward entries may survive
+        _prune(fwd, bwd, by_rank, forward=True)
+        _prune(bwd, fwd, by_rank, forward=False)
+        return cls(_pack(fwd), _pack(bwd), ch.up.node_ids, ch.up.node_index)
+
+    @classmethod
+    def build(cls, graph: Union[CSRGraph, Graph], **ch_options) -> "HubLabels":
+        return cls.from_ch(ContractionHierarchy.build(graph, **ch_options))
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.fwd_offsets) - 1
+
+    def average_label_size(self) -> float:
+        n = self.num_nodes
+        return (len(self.fwd_hubs) + len(self.bwd_hubs)) / (2 * n) if n else 0.0
+
+    def dense_id(self, node: Hashable) -> int:
+        if self.node_index is not None:
+            return self.node_index[node]
+        if isinstance(node, int) and 0 <= node < self.num_nodes:
+            return node
+        raise KeyError(node)
+
+    def distance(self, source: Node, target: Node) -> float:
+        """Shortest s-t distance by merging Lf(s) and Lb(t); inf if unreachable."""
+        s, t = self.dense_id(source), self.dense_id(target)
+        i, i_end = self.fwd_offsets[s], self.fwd_offsets[s + 1]
+        j, j_end = self.bwd_offsets[t], self.bwd_offsets[t + 1]
+        fh, fd, bh, bd = self.fwd_hubs, self.fwd_dists, self.bwd_hubs, self.bwd_dists
+        best = INF
+        while i < i_end and j < j_end:
+            a, b = fh[i], bh[j]
+            if a == b:
+                d = fd[i] + bd[j]
+                if d < best:
+                    best = d
+                i += 1
+                j += 1
+            elif a < b:
+                i += 1
+            else:
+                j += 1
+        return best
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        """Write the labels; node IDs must be JSON-serializable if they are not 0..V-1."""
+        tables = [array(t.typecode, t) for t in (
+            self.fwd_offsets, self.fwd_hubs, self.fwd_dists,
+            self.bwd_offsets, self.bwd_hubs, self.bwd_dists)]
+        if sys.byteorder != "little":
+            for t in tables:
+                t.byteswap()
+        ids = b"" if isinstance(self.node_ids, range) else json.dumps(list(self.node_ids)).encode()
+        ids_offset = HUB_HEADER_SIZE + sum(8 * len(t) for t in tables)
+        header = HUB_HEADER.pack(HUB_FILE_MAGIC, self.num_nodes, len(self.fwd_hubs),
+                                 len(self.bwd_hubs), ids_offset, len(ids))
+        with open(path, "wb") as f:
+            f.write(header.ljust(HUB_HEADER_SIZE, b"\0"))
+            for t in tables:
+                t.tofile(f)
+            f.write(ids)
+
+    @classmethod
+    def load(cls, path: str) -> "HubLabels":
+        """
+        Memory-map a file written by save(); the arrays are read-only views.
+        On a big-endian machine they are byteswapped copies instead.
+        """
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, nf, nb, ids_offset, ids_len = HUB_HEADER.unpack_from(mm, 0)
+        if magic != HUB_FILE_MAGIC:
+            raise ValueError(f"{path} is not a hub label file")
+
+        view = memoryview(mm)
+        pos = HUB_HEADER_SIZE
+        tables = []
+        for typecode, count in (("q", n + 1), ("q", nf), ("d", nf),
+                                ("q", n + 1), ("q", nb), ("d", nb)):
+            table = view[pos:pos + 8 * count].cast(typecode)
+            if sys.byteorder != "little":
+                table = array(typecode, table.tobytes())
+                table.byteswap()
+            tables.append(table)
+            pos += 8 * count
+
+        if ids_len:
+            raw = json.loads(bytes(view[ids_offset:ids_offset + ids_len]))
+            node_ids: Sequence[Hashable] = [tuple(x) if isinstance(x, list) else x for x in raw]
+            node_index = {u: i for i, u in enumerate(node_ids)}
+        else:
+            node_ids, node_index = range(n), None
+        labels = cls(tuple(tables[:3]), tuple(tables[3:]), node_ids, node_index)
+        labels._mmap = mm
+        return labels
@@ -0,0 +1,191 @@
+# Dijkstras_Implicit.py
+"""
+Dijkstra over implicit graphs: neighbours come from a callback, not a Graph dict.
+
+An implicit graph is either a callable neighbors(u) -> iterable of (v, w)
+or an object with a .neighbors(u) method. Generators work too. Nodes can be
+any hashable values, so no adjacency is ever materialized, and memory grows
+only with the explored region.
+
+    distances / predecessors   dicts holding only reached nodes
+    settled set                a Python set. With bitmap=True and a graph
+                               that has a num_nodes attribute, node IDs are
+                               taken to be packed ints in range(num_nodes)
+                               and a bitmap of num_nodes / 8 bytes is used
+                               instead, if it fits in BITMAP_MAX_BYTES. The
+                               bitmap is sized by the whole graph, not the
+                               explored region, so it only pays off when a
+                               search settles a large share of the nodes.
+
+GridGraph is a built-in adapter for 2D grids with 4- or 8-connectivity.
+Cells are packed into ints as row * width + col.
+"""
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+import heapq
+import math
+
+from Dijkstras_CSR import INF
+
+Neighbors = Callable[[Hashable], Iterable[Tuple[Hashable, float]]]
+
+BITMAP_MAX_BYTES = 16 << 20  # largest settled bitmap; bigger graphs use a set
+
+class _SetVisited:
+    __slots__ = ("seen",)
+
+    def __init__(self) -> None:
+        self.seen = set()
+
+    def add(self, u: Hashable) -> None:
+        self.seen.add(u)
+
+    def __contains__(self, u: Hashable) -> bool:
+        return u in self.seen
+
+class _BitmapVisited:
+    __slots__ = ("bits",)
+
+    def __init__(self, n: int) -> None:
+        self.bits = bytearray((n + 7) >> 3)
+
+    def add(self, u: int) -> None:
+        self.bits[u >> 3] |= 1 << (u & 7)
+
+    def __contains__(self, u: int) -> bool:
+        return bool(self.bits[u >> 3] >> (u & 7) & 1)
+
+def _search(graph, source, targets, max_dist, stats, bitmap) -> Tuple[Dict[Hashable, float], Dict[Hashable, Hashable]]:
+    neighbors: Neighbors = graph if callable(graph) else graph.neighbors
+    num_nodes = getattr(graph, "num_nodes", None) if bitmap else None
+    if num_nodes is not None and (num_nodes + 7) >> 3 <= BITMAP_MAX_BYTES:
+        settled = _BitmapVisited(num_nodes)
+    else:
+        settled = _SetVisited()
+    remaining = None if targets is None else set(targets)
+    limit = INF if max_dist is None else max_dist
+
+    dist: Dict[Hashable, float] = {source: 0.0}
+    pred: Dict[Hashable, Hashable] = {}
+    final: Dict[Hashable, float] = {}
+    heap: List[Tuple[float, int, Hashable]] = [(0.0, 0, source)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    tie = 1  # arbitrary hashable nodes need not be comparable
+
+    while heap:
+        d_u, _, u = heappop(heap)
+        if u in settled:
+            continue
+        if d_u > limit:
+            break
+        settled.add(u)
+        final[u] = d_u
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+        for v, w in neighbors(u):
+            if v in settled:
+                continue
+            new_dist = d_u + w
+            if new_dist < dist.get(v, INF):
+                dist[v] = new_dist
+                pred[v] = u
+                heappush(heap, (new_dist, tie, v))
+                tie += 1
+
+    if stats is not None:
+        stats["settled"] = len(final)
+        stats["reached"] = len(dist)
+    return final, pred
+
+def dijkstra_implicit(
+    graph: Union[Neighbors, object],
+    source: Hashable,
+    targets: Optional[Iterable[Hashable]] = None,
+    max_dist: Optional[float] = None,
+    stats: Optional[Dict[str, int]] = None,
+    bitmap: bool = False,
+) -> Dict[Hashable, float]:
+    """
+    Shortest path distances from `source` over an implicit graph, as a dict
+    of settled nodes. The search is unbounded unless `targets` (stop once
+    all are settled) or `max_dist` (radius) is given, so use one of them on
+    infinite or very large graphs.
+
+    If `stats` is given, stats["settled"] and stats["reached"] are set to the
+    number of settled and discovered nodes. `bitmap` selects the settled
+    bitmap described in the module docstring.
+    """
+    return _search(graph, source, targets, max_dist, stats, bitmap)[0]
+
+def implicit_shortest_path(
+    graph: Union[Neighbors, object],
+    source: Hashable,
+    target: Hashable,
+    stats: Optional[Dict[str, int]] = None,
+    bitmap: bool = False,
+) -> Tuple[float, List[Hashable]]:
+    """(distance, path) from source to target, or (inf, []) if target is unreachable."""
+    final, pred = _search(graph, source, [target], None, stats, bitmap)
+    if target not in final:
+        return INF, []
+    path = [target]
+    while path[-1] != source:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return final[target], path
+
+class GridGraph:
+    """
+    width x height grid whose nodes are packed ints row * width + col.
+
+    passable(row, col) marks blocked cells (default: all passable), and
+    cost(row, col) is the cost of entering a cell (default 1.0). With
+    connectivity=8 a diagonal step costs diagonal_cost times the entered
+    cell's cost. Diagonal steps never cut a corner past a blocked cell.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        connectivity: int = 4,
+        passable: Optional[Callable[[int, int], bool]] = None,
+        cost: Optional[Callable[[int, int], float]] = None,
+        diagonal_cost: float = math.sqrt(2.0),
+    ) -> None:
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity must be 4 or 8")
+        self.width = width
+        self.height = height
+        self.connectivity = connectivity
+        self.passable = passable
+        self.cost = cost
+        self.diagonal_cost = diagonal_cost
+
+    @property
+    def num_nodes(self) -> int:
+        return self.width * self.height
+
+    def node(self, row: int, col: int) -> int:
+        return row * self.width + col
+
+    def cell(self, node: int) -> Tuple[int, int]:
+        return divmod(node, self.width)
+
+    def _open(self, row: int, col: int) -> bool:
+        return (0 <= row < self.height and 0 <= col < self.width
+                and (self.passable is None or self.passable(row, col)))
+
+    def neighbors(self, u: int) -> Iterable[Tuple[int, float]]:
+        row, col = divmod(u, self.width)
+        is_open, cost, width = self._open, self.cost, self.width
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            r, c = row + dr, col + dc
+            if is_open(r, c):
+                yield r * width + c, 1.0 if cost is None else cost(r, c)
+        if self.connectivity == 8:
+            for dr, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+                r, c = row + dr, col + dc
+                if is_open(r, c) and is_open(row + dr, col) and is_open(row, col + dc):
+                    yield r * width + c, self.diagonal_cost * (1.0 if cost is None else cost(r, c))
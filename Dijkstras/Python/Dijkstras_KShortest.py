@@ -0,0 +1,211 @@
+# Dijkstras_KShortest.py
+"""
+k shortest loopless s-t paths (Yen's algorithm) on a CSR graph.
+
+Yen's algorithm derives each new path from the previous one. Every node of
+that path is tried as a spur node: the root (the prefix up to the spur node)
+is kept, and the cheapest spur path to t is found after two kinds of
+blocking. Edges that earlier paths with the same root take out of the spur
+node are blocked. So are the root's nodes, which keeps the path loopless.
+Three things keep this cheap here:
+
+    reverse shortest-path tree
+        One Dijkstra from t on graph.reverse() gives h(v) = d(v, t) in the
+        full graph. Blocking only removes edges, so h is a consistent lower
+        bound for every spur search, which runs as A* and stops as soon as
+        t is settled. Nodes with h = inf cannot reach t and are never queued.
+    tree shortcut
+        If the tree path from the spur node to t avoids every blocked node
+        and edge, it is optimal (its cost equals the lower bound), and no
+        search is run.
+    masks, not copies
+        Blocked nodes and edges are generation stamps in arrays over the
+        dense node and edge IDs, and A* state uses stamps too. A spur search
+        never copies the graph and never clears O(V) state.
+
+stats reports settled nodes summed over all spur searches, along with the
+number of searches and shortcuts.
+"""
+from array import array
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+import heapq
+
+from Dijkstras_CSR import INF, CSRGraph, Graph, Node, as_csr, dijkstra_csr
+
+class _SpurSearch:
+    """A* from a spur node to the target with blocked nodes/edges, reusing stamped arrays."""
+
+    def __init__(self, graph: CSRGraph, target: int, h: array, succ: array, succ_edge: array) -> None:
+        self.graph = graph
+        self.target = target
+        self.h = h
+        self.succ = succ
+        self.succ_edge = succ_edge
+        n, m = graph.num_nodes, graph.num_edges
+        self.dist = array("d", [INF]) * n
+        self.pred_edge = array("q", [-1]) * n
+        self.pred_node = array("q", [-1]) * n
+        self.seen = array("q", [0]) * n          # stamp: dist / pred_edge valid this search
+        self.blocked_node = array("q", [0]) * n  # stamp: node blocked for this spur
+        self.blocked_edge = array("q", [0]) * m  # stamp: edge blocked for this spur
+        self.mask_gen = 1  # stamps start at 0, so the first mask blocks nothing
+        self.search_gen = 0
+        self.settled = 0
+        self.searches = 0
+        self.shortcuts = 0
+
+    def new_mask(self) -> int:
+        self.mask_gen += 1
+        return self.mask_gen
+
+    def _tree_path(self, spur: int) -> Optional[List[int]]:
+        """Edge IDs of the tree path spur -> target if it avoids the current mask."""
+        gen = self.mask_gen
+        blocked_node, blocked_edge = self.blocked_node, self.blocked_edge
+        succ, succ_edge = self.succ, self.succ_edge
+        edges = []
+        u = spur
+        while u != self.target:
+            i = succ_edge[u]
+            if blocked_edge[i] == gen:
+                return None
+            u = succ[u]
+            if blocked_node[u] == gen:
+                return None
+            edges.append(i)
+        return edges
+
+    def run(self, spur: int) -> Optional[List[int]]:
+        """Edge IDs of the cheapest unblocked path spur -> target, or None."""
+        if self.h[spur] == INF:
+            return None
+        edges = self._tree_path(spur)
+        if edges is not None:
+            self.shortcuts += 1
+            return edges
+
+        self.searches += 1
+        self.search_gen += 1
+        gen, mask = self.search_gen, self.mask_gen
+        g, h, target = self.graph, self.h, self.target
+        offsets, targets, weights = g.offsets, g.targets, g.weights
+        dist, pred_edge, pred_node, seen = self.dist, self.pred_edge, self.pred_node, self.seen
+        blocked_node, blocked_edge = self.blocked_node, self.blocked_edge
+
+        seen[spur] = gen
+        dist[spur] = 0.0
+        heap = [(h[spur], spur)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while heap:
+            f_u, u = heappop(heap)
+            d_u = dist[u]
+            if f_u > d_u + h[u]:
+                continue
+            self.settled += 1
+            if u == target:
+                break
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if blocked_edge[i] == mask or blocked_node[v] == mask or h[v] == INF:
+                    continue
+                new_dist = d_u + weights[i]
+                if seen[v] != gen or new_dist < dist[v]:
+                    seen[v] = gen
+                    dist[v] = new_dist
+                    pred_edge[v] = i
+                    pred_node[v] = u
+                    heappush(heap, (new_dist + h[v], v))
+        else:
+            return None
+
+        edges = []
+        u = target
+        while u != spur:
+            edges.append(pred_edge[u])
+            u = pred_node[u]
+        edges.reverse()
+        return edges
+
+def k_shortest_paths(
+    graph: Union[CSRGraph, Graph],
+    source: Node,
+    target: Node,
+    k: int,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[Tuple[float, List[Hashable]]]:
+    """
+    Up to k loopless source-target paths in order of increasing cost, as
+    (cost, [node IDs]). Parallel edges count as different paths.
+
+    If `stats` is given, stats["settled"] is set to the number of nodes
+    settled by all spur searches, including the reverse tree, and
+    stats["spur_searches"] / stats["shortcuts"] to the number of spur nodes
+    that needed an A* search / were answered by the reverse tree.
+    """
+    g = as_csr(graph)
+    s, t = g.dense_id(source), g.dense_id(target)
+    n = g.num_nodes
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+
+    # Reverse shortest-path tree: h(v) = d(v, t), succ[v] = next node towards t
+    succ = array("q", [-1]) * n
+    h = dijkstra_csr(g.reverse(), target, pred=succ).array
+    succ_edge = array("q", [-1]) * n
+    for u in range(n):
+        v = succ[u]
+        if v >= 0:
+            for i in range(offsets[u], offsets[u + 1]):
+                if targets[i] == v and weights[i] + h[v] == h[u]:
+                    succ_edge[u] = i
+                    break
+    spur_search = _SpurSearch(g, t, h, succ, succ_edge)
+
+    def cost(edges: List[int]) -> float:
+        total = 0.0
+        for i in edges:
+            total += weights[i]
+        return total
+
+    def nodes_of(edges: List[int]) -> List[int]:
+        return [s] + [targets[i] for i in edges]
+
+    found: List[Tuple[float, List[int]]] = []
+    first = spur_search.run(s) if s != t else []
+    if first is not None and k > 0:
+        found.append((cost(first), first))
+    candidates: List[Tuple[float, int, List[int]]] = []
+    queued = {tuple(first)} if first is not None else set()
+    tie = 0
+
+    while found and len(found) < k:
+        prev = found[-1][1]
+        prev_nodes = nodes_of(prev)
+        for i in range(len(prev)):
+            spur = prev_nodes[i]
+            root = prev[:i]
+            gen = spur_search.new_mask()
+            for _, p in found:
+                if p[:i] == root and len(p) > i:
+                    spur_search.blocked_edge[p[i]] = gen
+            for u in prev_nodes[:i]:
+                spur_search.blocked_node[u] = gen
+            spur_path = spur_search.run(spur)
+            if spur_path is None:
+                continue
+            edges = root + spur_path
+            key = tuple(edges)
+            if key not in queued:
+                queued.add(key)
+                heapq.heappush(candidates, (cost(edges), tie, edges))
+                tie += 1
+        if not candidates:
+            break
+        c, _, edges = heapq.heappop(candidates)
+        found.append((c, edges))
+
+    if stats is not None:
+        stats["settled"] = spur_search.settled + n - list(h).count(INF)
+        stats["spur_searches"] = spur_search.searches
+        stats["shortcuts"] = spur_search.shortcuts
+    ids = g.node_ids
+    return [(c, [ids[u] for u in nodes_of(edges)]) for c, edges in found]
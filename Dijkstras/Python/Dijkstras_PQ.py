@@ -0,0 +1,320 @@
+# Dijkstras_PQ.py
+"""
+Pluggable priority-queue backends for the CSR Dijkstra engine.
+
+Every backend is constructed with the number of (dense) nodes and exposes:
+
+    push(node, key)   insert node, or lower its key if it is already queued
+    pop() -> (key, node)
+    len(queue)        number of queued entries
+    queue.peak        largest len(queue) seen so far
+
+Backends:
+    "lazy"     heapq with duplicate entries; stale entries are popped and
+               skipped by the engine. This is what the Round implementations do,
+               and on dense graphs the heap grows to O(E).
+    "dary"     indexed d-ary heap with true decrease-key, stored in parallel
+               arrays (heap slots, node positions, keys). At most V entries.
+    "pairing"  pairing heap with decrease-key, nodes linked through arrays.
+
+dijkstra_pq() also supports early-exit queries (target sets, k nearest
+matching nodes, radius-bounded isochrones); nearest() and isochrone() are
+thin wrappers for the common cases.
+"""
+from array import array
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+import heapq
+
+from Dijkstras_CSR import INF, CSRGraph, DistanceView, Graph, Node, as_csr
+
+class LazyHeap:
+    __slots__ = ("heap", "peak")
+
+    def __init__(self, n: int) -> None:
+        self.heap: List[Tuple[float, int]] = []
+        self.peak = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, node: int, key: float) -> None:
+        heap = self.heap
+        heapq.heappush(heap, (key, node))
+        if len(heap) > self.peak:
+            self.peak = len(heap)
+
+    def pop(self) -> Tuple[float, int]:
+        return heapq.heappop(self.heap)
+
+class IndexedDaryHeap:
+    __slots__ = ("d", "slots", "pos", "keys", "size", "peak")
+
+    def __init__(self, n: int, d: int = 4) -> None:
+        self.d = d
+        self.slots = array("q", bytes(8 * n))  # heap position -> node
+        self.pos = array("q", [-1]) * n        # node -> heap position, -1 if not queued
+        self.keys = array("d", [INF]) * n
+        self.size = 0
+        self.peak = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, node: int, key: float) -> None:
+        i = self.pos[node]
+        if i < 0:
+            i = self.size
+            self.size = i + 1
+            if self.size > self.peak:
+                self.peak = self.size
+        elif key >= self.keys[node]:
+            return
+        self.keys[node] = key
+        self._sift_up(i, node, key)
+
+    def pop(self) -> Tuple[float, int]:
+        slots = self.slots
+        top = slots[0]
+        self.pos[top] = -1
+        self.size -= 1
+        if self.size:
+            self._sift_down(0, slots[self.size])
+        return self.keys[top], top
+
+    def _sift_up(self, i: int, node: int, key: float) -> None:
+        slots, pos, keys, d = self.slots, self.pos, self.keys, self.d
+        while i:
+            parent = (i - 1) // d
+            p_node = slots[parent]
+            if keys[p_node] <= key:
+                break
+            slots[i] = p_node
+            pos[p_node] = i
+            i = parent
+        slots[i] = node
+        pos[node] = i
+
+    def _sift_down(self, i: int, node: int) -> None:
+        slots, pos, keys, d, size = self.slots, self.pos, self.keys, self.d, self.size
+        key = keys[node]
+        while True:
+            first = d * i + 1
+            if first >= size:
+                break
+            best = first
+            best_key = keys[slots[first]]
+            for c in range(first + 1, min(first + d, size)):
+                c_key = keys[slots[c]]
+                if c_key < best_key:
+                    best, best_key = c, c_key
+            if best_key >= key:
+                break
+            c_node = slots[best]
+            slots[i] = c_node
+            pos[c_node] = i
+            i = best
+        slots[i] = node
+        pos[node] = i
+
+class PairingHeap:
+    __slots__ = ("keys", "child", "sibling", "prev", "queued", "root", "size", "peak")
+
+    def __init__(self, n: int) -> None:
+        self.keys = array("d", [INF]) * n
+        self.child = array("q", [-1]) * n
+        self.sibling = array("q", [-1]) * n
+        self.prev = array("q", [-1]) * n  # parent for a first child, else left sibling
+        self.queued = bytearray(n)
+        self.root = -1
+        self.size = 0
+        self.peak = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _meld(self, a: int, b: int) -> int:
+        """Meld two detached trees and return the new root."""
+        keys, child, sibling, prev = self.keys, self.child, self.sibling, self.prev
+        if keys[b] < keys[a]:
+            a, b = b, a
+        first = child[a]
+        sibling[b] = first
+        if first >= 0:
+            prev[first] = b
+        prev[b] = a
+        child[a] = b
+        return a
+
+    def push(self, node: int, key: float) -> None:
+        if not self.queued[node]:
+            self.queued[node] = 1
+            self.keys[node] = key
+            self.child[node] = self.sibling[node] = self.prev[node] = -1
+            self.root = node if self.root < 0 else self._meld(self.root, node)
+            self.size += 1
+            if self.size > self.peak:
+                self.peak = self.size
+            return
+
+        if key >= self.keys[node]:
+            return
+        self.keys[node] = key
+        if node == self.root:
+            return
+        # Cut the subtree rooted at node and meld it back in with the root
+        child, sibling, prev = self.child, self.sibling, self.prev
+        p = prev[node]
+        nxt = sibling[node]
+        if child[p] == node:
+            child[p] = nxt
+        else:
+            sibling[p] = nxt
+        if nxt >= 0:
+            prev[nxt] = p
+        sibling[node] = prev[node] = -1
+        self.root = self._meld(self.root, node)
+
+    def pop(self) -> Tuple[float, int]:
+        top = self.root
+        child, sibling, prev = self.child, self.sibling, self.prev
+        self.queued[top] = 0
+        self.size -= 1
+
+        # Two-pass pairing: meld children left to right in pairs, then fold right to left
+        pairs: List[int] = []
+        c = child[top]
+        while c >= 0:
+            nxt = sibling[c]
+            sibling[c] = prev[c] = -1
+            if nxt >= 0:
+                after = sibling[nxt]
+                sibling[nxt] = prev[nxt] = -1
+                pairs.append(self._meld(c, nxt))
+                c = after
+            else:
+                pairs.append(c)
+                c = -1
+        root = -1
+        for t in reversed(pairs):
+            root = t if root < 0 else self._meld(t, root)
+        self.root = root
+        child[top] = -1
+        return self.keys[top], top
+
+PQ_BACKENDS = {
+    "lazy": LazyHeap,
+    "dary": IndexedDaryHeap,
+    "pairing": PairingHeap,
+}
+
+def dijkstra_pq(
+    graph: Union[CSRGraph, Graph],
+    source: Node,
+    pq: str = "lazy",
+    stats: Optional[Dict[str, int]] = None,
+    targets: Optional[Iterable[Node]] = None,
+    k_nearest: Optional[int] = None,
+    predicate: Optional[Callable[[Hashable], bool]] = None,
+    max_dist: Optional[float] = None,
+    pred: Optional[array] = None,
+) -> DistanceView:
+    """
+    Compute the shortest path distance from `source` to every reachable node,
+    using the priority-queue backend named by `pq` (see PQ_BACKENDS).
+    `pred` records the shortest-path tree as in dijkstra_csr().
+
+    Early-exit query modes (they can be combined; the search stops at the
+    first condition met):
+        targets=    stop once every node in targets is settled
+        k_nearest=  stop once k settled nodes satisfy predicate (any node
+                    if predicate is None); the source counts if it matches.
+                    k must be at least 1 (ValueError otherwise)
+        max_dist=   never settle a node farther than max_dist (isochrone)
+    In these modes the result holds only settled nodes, i.e. exactly the
+    nodes whose distance is final; pred entries of other nodes are tentative.
+
+    If `stats` is given, stats["peak_heap"] is set to the largest number of
+    entries the queue held at once and stats["settled"] to the number of
+    settled nodes.
+    """
+    if k_nearest is not None and k_nearest < 1:
+        raise ValueError("k_nearest must be at least 1")
+    graph = as_csr(graph)
+    s = graph.dense_id(source)
+    offsets, edge_targets, weights = graph.offsets, graph.targets, graph.weights
+
+    early = targets is not None or k_nearest is not None or max_dist is not None
+    remaining = None
+    if targets is not None:
+        remaining = {graph.dense_id(t) for t in targets}
+    wanted = k_nearest
+    node_ids = graph.node_ids
+    limit = INF if max_dist is None else max_dist
+    settled: List[int] = []
+
+    dist = array("d", [INF]) * graph.num_nodes
+    dist[s] = 0.0
+    queue = PQ_BACKENDS[pq](graph.num_nodes)
+    push, pop = queue.push, queue.pop
+    push(s, 0.0)
+    num_settled = 0
+
+    while len(queue):
+        d_u, u = pop()
+        if d_u > dist[u]:
+            continue  # stale entry, only possible with the lazy backend
+        num_settled += 1
+        if early:
+            if d_u > limit:
+                num_settled -= 1
+                break
+            settled.append(u)
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+            if wanted is not None and (predicate is None or predicate(node_ids[u])):
+                wanted -= 1
+                if wanted <= 0:
+                    break
+        for i in range(offsets[u], offsets[u + 1]):
+            v = edge_targets[i]
+            new_dist = d_u + weights[i]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                if pred is not None:
+                    pred[v] = u
+                push(v, new_dist)
+
+    if stats is not None:
+        stats["peak_heap"] = queue.peak
+        stats["settled"] = num_settled
+    if early:
+        # Tentative distances of unsettled nodes are not final; keep only settled ones
+        final = array("d", [INF]) * graph.num_nodes
+        for u in settled:
+            final[u] = dist[u]
+        dist = final
+    return DistanceView(dist, graph)
+
+def nearest(
+    graph: Union[CSRGraph, Graph],
+    source: Node,
+    k: int,
+    predicate: Optional[Callable[[Hashable], bool]] = None,
+    pq: str = "lazy",
+) -> List[Tuple[Hashable, float]]:
+    """The k nearest nodes satisfying predicate, as (node, distance) in increasing distance."""
+    found = dijkstra_pq(graph, source, pq=pq, k_nearest=k, predicate=predicate)
+    matches = [(u, d) for u, d in found.items() if predicate is None or predicate(u)]
+    matches.sort(key=lambda item: item[1])
+    return matches[:k]
+
+def isochrone(
+    graph: Union[CSRGraph, Graph],
+    source: Node,
+    max_dist: float,
+    pq: str = "lazy",
+) -> DistanceView:
+    """Every node within max_dist of source, with its distance."""
+    return dijkstra_pq(graph, source, pq=pq, max_dist=max_dist)
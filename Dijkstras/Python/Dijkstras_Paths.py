@@ -0,0 +1,112 @@
+# Dijkstras_Paths.py
+"""
+Shortest-path trees stored as predecessor arrays.
+
+Every SSSP engine accepts a `pred` argument: an array('q') of V entries set
+to -1. The engine writes pred[v] = u on each improving relaxation, which
+costs one int store and no allocation. PredecessorTree wraps the finished
+array:
+
+    walk_back(t)      lazy generator t, pred[t], ..., source
+    path(t)           source ... t; only the dense chain is buffered, in an
+                      array('q'), and node IDs are produced lazily
+    tree_order()      preorder of the tree from the source, as array('q')
+    subtree_sizes()   number of tree nodes below each node (itself included)
+
+shortest_path_tree() runs any engine with a fresh pred array and returns
+(distances, tree).
+"""
+from array import array
+from typing import Callable, Hashable, Iterator, Tuple, Union
+
+from Dijkstras_CSR import CSRGraph, DistanceView, Graph, Node, as_csr, dijkstra_csr
+
+class PredecessorTree:
+    __slots__ = ("pred", "graph", "source")
+
+    def __init__(self, pred: array, graph: CSRGraph, source: Node) -> None:
+        self.pred = pred
+        self.graph = graph
+        self.source = graph.dense_id(source)
+
+    def reached(self, node: Node) -> bool:
+        v = self.graph.dense_id(node)
+        return v == self.source or self.pred[v] >= 0
+
+    def walk_back(self, node: Node) -> Iterator[Hashable]:
+        """node, its predecessor, ..., the source; nothing if node was not reached."""
+        v = self.graph.dense_id(node)
+        if v != self.source and self.pred[v] < 0:
+            return
+        ids, pred = self.graph.node_ids, self.pred
+        while v >= 0:
+            yield ids[v]
+            v = pred[v]
+
+    def path(self, node: Node) -> Iterator[Hashable]:
+        """source, ..., node; nothing if node was not reached."""
+        v = self.graph.dense_id(node)
+        if v != self.source and self.pred[v] < 0:
+            return
+        chain = array("q")
+        pred = self.pred
+        while v >= 0:
+            chain.append(v)
+            v = pred[v]
+        ids = self.graph.node_ids
+        for i in range(len(chain) - 1, -1, -1):
+            yield ids[chain[i]]
+
+    def _children(self) -> Tuple[array, array]:
+        """Tree edges as CSR (offsets, children), by counting sort on pred."""
+        n = self.graph.num_nodes
+        pred = self.pred
+        offsets = array("q", bytes(8 * (n + 1)))
+        for p in pred:
+            if p >= 0:
+                offsets[p + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        fill = offsets[:-1]
+        children = array("q", bytes(8 * offsets[n]))
+        for v, p in enumerate(pred):
+            if p >= 0:
+                children[fill[p]] = v
+                fill[p] += 1
+        return offsets, children
+
+    def tree_order(self) -> array:
+        """Dense IDs of the reached nodes in preorder: every node before its subtree."""
+        offsets, children = self._children()
+        order = array("q")
+        stack = [self.source]
+        while stack:
+            u = stack.pop()
+            order.append(u)
+            stack.extend(children[offsets[u]:offsets[u + 1]])
+        return order
+
+    def subtree_sizes(self) -> array:
+        """Per dense node, the number of tree nodes in its subtree (0 if unreached)."""
+        order = self.tree_order()
+        sizes = array("q", bytes(8 * self.graph.num_nodes))
+        pred = self.pred
+        for i in range(len(order) - 1, -1, -1):
+            u = order[i]
+            sizes[u] += 1
+            p = pred[u]
+            if p >= 0:
+                sizes[p] += sizes[u]
+        return sizes
+
+def shortest_path_tree(
+    graph: Union[CSRGraph, Graph],
+    source: Node,
+    engine: Callable[..., DistanceView] = dijkstra_csr,
+    **kwargs,
+) -> Tuple[DistanceView, PredecessorTree]:
+    """Run engine(graph, source, pred=..., **kwargs) and return (distances, tree)."""
+    graph = as_csr(graph)
+    pred = array("q", [-1]) * graph.num_nodes
+    dist = engine(graph, source, pred=pred, **kwargs)
+    return dist, PredecessorTree(pred, graph, source)
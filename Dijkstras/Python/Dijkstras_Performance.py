@@ -4,17 +4,27 @@ Performance benchmark harness for Python Dijkstra algorithms.
 
 Assumes each algorithm is a function:
     def dijkstra(graph: Graph, source: Node) -> Dict[Node, float]:
+
+Run with --pq lazy,dary,pairing to sweep the priority-queue backends of the
+CSR engine instead; that sweep also records the peak heap size.
 """
 
+import argparse
 import time
 import random
 import csv
+from functools import partial
 from typing import Dict, List, Tuple
 
 from Dijkstras_ChatGPT import dijkstra as dijkstra_chatgpt
 from Dijkstras_DeepSeek import dijkstra as dijkstra_deepseek
 from Dijkstras_Claude import dijkstra as dijkstra_claude
 from Dijkstras_Gemini import dijkstra as dijkstra_gemini
+from Dijkstras_BellmanFord import bellman_ford
+from Dijkstras_CSR import CSRGraph, dijkstra_csr
+from Dijkstras_Dense import dijkstra_auto, prepare_auto
+from Dijkstras_Dynamic import DynamicGraph
+from Dijkstras_PQ import PQ_BACKENDS, dijkstra_pq
 
 Node = int
 Weight = float
@@ -25,6 +35,16 @@ ALGORITHMS = {
     "deepseek_py": dijkstra_deepseek,
     "claude_py": dijkstra_claude,
     "gemini_py": dijkstra_gemini,
+    "csr_py": dijkstra_csr,
+    "auto_py": dijkstra_auto,
+    "bf_py": bellman_ford,
+}
+
+# Engines that run on a converted graph; conversion happens outside the timer
+PREPARE = {
+    "csr_py": CSRGraph.from_graph,
+    "auto_py": prepare_auto,
+    "bf_py": CSRGraph.from_graph,
 }
 
 def gen_random_graph(num_nodes: int, edge_prob: float) -> Graph:
@@ -38,50 +58,165 @@ def gen_random_graph(num_nodes: int, edge_prob: float) -> Graph:
                 g[u].append((v, w))
     return g
 
-def bench():
-    random.seed(1)
+def pq_sweep_algorithms(backends: List[str]):
+    """One dijkstra_pq entry per backend, all running on CSR graphs."""
+    algorithms = {f"pq_{b}": partial(dijkstra_pq, pq=b) for b in backends}
+    prepare = {name: CSRGraph.from_graph for name in algorithms}
+    return algorithms, prepare
 
+def bench(algorithms=ALGORITHMS, prepare_funcs=PREPARE,
+          filename="python_dijkstra_bench.csv", with_stats=False):
+    """
+    Time every algorithm on the same random graphs.
+
+    With with_stats=True each algorithm is called with a stats dict (see
+    dijkstra_pq) and the largest peak heap size is written to the CSV.
+    """
     # choose sizes and densities
     SIZES = [50, 100, 200, 500]      # number of nodes
     EDGE_PROBS = [0.05, 0.1, 0.2]    # edge probability
     RUNS_PER_COMBO = 5               # how many graphs per (n, p)
 
-    with open("python_dijkstra_bench.csv", "w", newline="") as f:
+    with open(filename, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow([
+        header = [
             "algorithm",
             "num_nodes",
             "edge_prob",
             "runs",
             "median_sec",
             "mean_sec",
-        ])
+        ]
+        if with_stats:
+            header.append("peak_heap")
+        writer.writerow(header)
 
-        for name, algo in ALGORITHMS.items():
+        for name, algo in algorithms.items():
             print("=" * 60)
             print(f"Benchmarking {name}")
+            prepare = prepare_funcs.get(name)
             for n in SIZES:
                 for p in EDGE_PROBS:
                     # pre-generate graphs + sources so all algos see same workload
+                    random.seed(f"{n}:{p}")
                     graphs = [gen_random_graph(n, p) for _ in range(RUNS_PER_COMBO)]
                     sources = [random.randrange(n) for _ in range(RUNS_PER_COMBO)]
+                    if prepare is not None:
+                        graphs = [prepare(g) for g in graphs]
                     times: List[float] = []
+                    peak_heap = 0
 
                     for g, s in zip(graphs, sources):
+                        stats: Dict[str, int] = {}
                         start = time.perf_counter()
-                        algo(g, s)
+                        if with_stats:
+                            algo(g, s, stats=stats)
+                        else:
+                            algo(g, s)
                         dt = time.perf_counter() - start
                         times.append(dt)
+                        peak_heap = max(peak_heap, stats.get("peak_heap", 0))
 
                     times.sort()
                     median = times[len(times) // 2]
                     mean = sum(times) / len(times)
 
+                    row = [name, n, p, len(times), median, mean]
+                    extra = ""
+                    if with_stats:
+                        row.append(peak_heap)
+                        extra = f", peak_heap={peak_heap}"
                     print(
                         f"{name}: n={n:4d}, p={p:.2f}, "
-                        f"median={median:.6f}s, mean={mean:.6f}s"
+                        f"median={median:.6f}s, mean={mean:.6f}s{extra}"
                     )
-                    writer.writerow([name, n, p, len(times), median, mean])
+                    writer.writerow(row)
+
+def random_update(dg: DynamicGraph, tree, kind: str):
+    """One update of the given kind; tree-edge kinds hit the current shortest-path tree."""
+    n = dg.csr.num_nodes
+    if kind == "insert":
+        return ("set", random.randrange(n), random.randrange(n), random.uniform(0.0, 10.0))
+    if kind == "decrease":
+        u = random.choice([u for u in range(n) if dg.out[u]])
+        v = random.choice(list(dg.out[u]))
+        return ("set", u, v, dg.out[u][v] / 2)
+    tree_nodes = [v for v in range(n) if tree.pred[v] >= 0]
+    if not tree_nodes:
+        return random_update(dg, tree, "insert")
+    v = random.choice(tree_nodes)
+    u = tree.pred[v]
+    if kind == "increase":
+        return ("set", u, v, dg.out[u][v] * 2 + 1.0)
+    return ("delete", u, v)
+
+def dynamic_bench(filename="python_dijkstra_dynamic_bench.csv"):
+    """Time single-edge updates of a DynamicGraph against recomputing with dijkstra_csr."""
+    SIZES = [200, 500, 1000, 2000]
+    EDGE_PROBS = [0.02, 0.05]
+    KINDS = ["increase", "decrease", "insert", "delete"]
+    UPDATES_PER_KIND = 20
+
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "kind", "num_nodes", "edge_prob", "updates",
+            "median_update_sec", "median_recompute_sec", "mean_touched",
+        ])
+        for n in SIZES:
+            for p in EDGE_PROBS:
+                random.seed(f"dynamic:{n}:{p}")
+                dg = DynamicGraph(gen_random_graph(n, p))
+                tree = dg.add_source(random.randrange(n))
+                source = tree.source
+                for kind in KINDS:
+                    update_times: List[float] = []
+                    recompute_times: List[float] = []
+                    touched = 0
+                    for _ in range(UPDATES_PER_KIND):
+                        update = random_update(dg, tree, kind)
+                        start = time.perf_counter()
+                        touched += dg.update([update])
+                        update_times.append(time.perf_counter() - start)
+
+                        current = CSRGraph.from_graph(dg.to_graph())
+                        start = time.perf_counter()
+                        dijkstra_csr(current, source)
+                        recompute_times.append(time.perf_counter() - start)
+
+                    update_times.sort()
+                    recompute_times.sort()
+                    median_update = update_times[len(update_times) // 2]
+                    median_recompute = recompute_times[len(recompute_times) // 2]
+                    mean_touched = touched / UPDATES_PER_KIND
+                    print(
+                        f"{kind:8s}: n={n:4d}, p={p:.2f}, update={median_update:.6f}s, "
+                        f"recompute={median_recompute:.6f}s, touched={mean_touched:.1f}"
+                    )
+                    writer.writerow([kind, n, p, UPDATES_PER_KIND,
+                                     median_update, median_recompute, mean_touched])
 
 if __name__ == "__main__":
-    bench()
+    parser = argparse.ArgumentParser(description="Benchmark the Python Dijkstra implementations")
+    parser.add_argument(
+        "--pq",
+        help=f"comma-separated priority-queue backends to sweep ({','.join(PQ_BACKENDS)})",
+    )
+    parser.add_argument(
+        "--dynamic",
+        action="store_true",
+        help="benchmark dynamic SSSP updates against full recomputation",
+    )
+    args = parser.parse_args()
+
+    if args.dynamic:
+        dynamic_bench()
+    elif args.pq:
+        backends = args.pq.split(",")
+        unknown = [b for b in backends if b not in PQ_BACKENDS]
+        if unknown:
+            parser.error(f"unknown --pq backend(s): {', '.join(unknown)}")
+        algorithms, prepare = pq_sweep_algorithms(backends)
+        bench(algorithms, prepare, "python_dijkstra_pq_bench.csv", with_stats=True)
+    else:
+        bench()
@@ -0,0 +1,160 @@
+# Dijkstras_ResultCache.py
+"""
+In-memory LRU cache of single-source shortest path results.
+
+Entries are keyed by (graph version, source, query mode). Each result is
+stored as its dense distance array (8 bytes per node) rather than a dict.
+The cache is bounded by the total size of those arrays and evicts the least
+recently used entry first.
+
+Graph versions:
+    GraphStore / Snapshot   (store_id, version). Every update bumps the
+                            version. The first lookup that sees a newer
+                            version drops all entries of older versions.
+    CSRGraph                a BLAKE2 digest of its arrays and node IDs,
+                            computed once per graph object (CSRGraph is
+                            immutable)
+    dict-of-lists Graph     a digest of the converted CSR, recomputed on every
+                            call because the dict can be mutated in place.
+                            Even a hit costs O(E), so dicts are not meant for
+                            the hot path: convert once with as_csr() and
+                            query the CSRGraph.
+
+Query modes are the keyword arguments of dijkstra_pq() (targets, k_nearest,
+predicate, max_dist). Stores only support full queries.
+
+Returned DistanceViews share the cached array and must not be modified.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+import hashlib
+import threading
+
+from Dijkstras_CSR import CSRGraph, DistanceView, Graph, Node, as_csr
+from Dijkstras_GraphStore import GraphStore, Snapshot, dijkstra_store
+from Dijkstras_PQ import dijkstra_pq
+
+DEFAULT_MAX_BYTES = 64 << 20
+FINGERPRINT_SLOTS = 64  # CSRGraph digests remembered at once
+
+def graph_fingerprint(graph: CSRGraph) -> bytes:
+    """Digest of the CSR arrays and the node ID mapping (sources are keyed by original ID)."""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in (graph.offsets, graph.targets, graph.weights):
+        h.update(memoryview(arr).cast("B"))
+    if isinstance(graph.node_ids, range):
+        h.update(b"range")
+    else:
+        h.update(repr(list(graph.node_ids)).encode())
+    return h.digest()
+
+class SSSPCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, pq: str = "lazy") -> None:
+        self.max_bytes = max_bytes
+        self.pq = pq
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple, DistanceView]" = OrderedDict()
+        self._versions: Dict[int, int] = {}  # store_id -> newest version seen
+        self._fingerprints: "OrderedDict[int, Tuple[CSRGraph, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _graph_key(self, graph) -> Tuple:
+        if isinstance(graph, (GraphStore, Snapshot)):
+            snap = graph.snapshot() if isinstance(graph, GraphStore) else graph
+            return ("store", snap.store_id, snap.version), snap
+        if not isinstance(graph, CSRGraph):
+            csr = as_csr(graph)
+            return ("csr", graph_fingerprint(csr)), csr
+        with self._lock:
+            known = self._fingerprints.get(id(graph))
+            if known is not None and known[0] is graph:
+                self._fingerprints.move_to_end(id(graph))
+                return ("csr", known[1]), graph
+        digest = graph_fingerprint(graph)
+        with self._lock:
+            self._fingerprints[id(graph)] = (graph, digest)
+            if len(self._fingerprints) > FINGERPRINT_SLOTS:
+                self._fingerprints.popitem(last=False)
+        return ("csr", digest), graph
+
+    def _drop_older(self, store_id: int, version: int) -> None:
+        """Invalidate entries of earlier versions of a store (caller holds the lock)."""
+        seen = self._versions.get(store_id)
+        if seen is not None and seen >= version:
+            return
+        self._versions[store_id] = version
+        if seen is None:
+            return
+        for key in [k for k in self._entries if k[0][0] == "store" and k[0][1] == store_id and k[0][2] < version]:
+            self._remove(key)
+            self.invalidations += 1
+
+    def _remove(self, key: Tuple) -> None:
+        view = self._entries.pop(key)
+        self.nbytes -= view.array.itemsize * len(view.array)
+
+    def get(self, graph: Union[GraphStore, Snapshot, CSRGraph, Graph], source: Node, **query) -> DistanceView:
+        """Cached dijkstra_pq(graph, source, **query), or dijkstra_store() for stores."""
+        graph_key, target = self._graph_key(graph)
+        mode = tuple(sorted(
+            (name, frozenset(value) if name == "targets" else value)
+            for name, value in query.items() if value is not None
+        ))
+        if graph_key[0] == "store" and mode:
+            raise ValueError("only full queries are cached for graph stores")
+        key = (graph_key, source, mode)
+
+        with self._lock:
+            if graph_key[0] == "store":
+                self._drop_older(graph_key[1], graph_key[2])
+            view = self._entries.get(key)
+            if view is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return view
+            self.misses += 1
+
+        # Computed without the lock so other sources are served meanwhile
+        if graph_key[0] == "store":
+            view = dijkstra_store(target, source)
+        else:
+            view = dijkstra_pq(target, source, pq=self.pq, **query)
+        size = view.array.itemsize * len(view.array)
+
+        with self._lock:
+            if size > self.max_bytes or key in self._entries:
+                return view
+            if graph_key[0] == "store" and self._versions[graph_key[1]] > graph_key[2]:
+                return view  # the store moved on while this result was computed
+            self._entries[key] = view
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return view
+
+    def invalidate(self, graph: Optional[Union[GraphStore, Snapshot, CSRGraph, Graph]] = None) -> None:
+        """Drop every entry, or only the entries for graph's current version."""
+        graph_key = None if graph is None else self._graph_key(graph)[0]
+        with self._lock:
+            keys = [k for k in self._entries if graph_key is None or k[0] == graph_key]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
@@ -0,0 +1,147 @@
+# Dijkstras_Workspace.py
+"""
+Reusable query workspace for running many Dijkstra queries on one graph.
+
+The Round implementations allocate a fresh dist dict and heap for every call.
+A DijkstraWorkspace is bound to one CSRGraph and preallocates dist/pred
+arrays plus two generation-stamp arrays. A slot is valid only when its stamp
+equals the current generation, so starting a new query is O(1): bump the
+generation instead of clearing O(V) arrays. The heap list and the settle
+order list are reused as well.
+
+A workspace holds per-query state and must not be shared between threads.
+workspace_for(graph) returns one workspace per (thread, graph), keeping a
+few recently used graphs per thread.
+"""
+from array import array
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+import heapq
+import threading
+
+from Dijkstras_CSR import INF, CSRGraph, Graph, Node, as_csr
+
+STAMP_LIMIT = (1 << 63) - 1
+WORKSPACE_SLOTS = 4  # workspaces kept per thread by workspace_for()
+
+class DijkstraWorkspace:
+    def __init__(self, graph: Union[CSRGraph, Graph]) -> None:
+        self.graph = as_csr(graph)
+        n = self.graph.num_nodes
+        self.dist = array("d", [INF]) * n
+        self.pred = array("q", [-1]) * n
+        self.reached = array("q", [0]) * n   # stamp: dist/pred are set this generation
+        self.settled = array("q", [0]) * n   # stamp: dist is final this generation
+        self.generation = 0
+        self.heap: List[Tuple[float, int]] = []
+        self.order: List[int] = []           # settled dense nodes of the last query, in order
+        self.source = -1
+
+    def _next_generation(self) -> int:
+        if self.generation == STAMP_LIMIT:
+            # Practically unreachable, but stamps must never collide
+            n = self.graph.num_nodes
+            self.reached = array("q", [0]) * n
+            self.settled = array("q", [0]) * n
+            self.generation = 0
+        self.generation += 1
+        return self.generation
+
+    def run(
+        self,
+        source: Node,
+        targets: Optional[Iterable[Node]] = None,
+        max_dist: Optional[float] = None,
+    ) -> "DijkstraWorkspace":
+        """
+        Run one query from `source`, replacing the previous query's results.
+        `targets` and `max_dist` stop early as in dijkstra_pq(). Returns self.
+        """
+        g = self.graph
+        s = g.dense_id(source)
+        offsets, edge_targets, weights = g.offsets, g.targets, g.weights
+        dist, pred, reached, settled = self.dist, self.pred, self.reached, self.settled
+        gen = self._next_generation()
+        remaining = None if targets is None else {g.dense_id(t) for t in targets}
+        limit = INF if max_dist is None else max_dist
+
+        heap = self.heap
+        heap.clear()
+        order = self.order
+        order.clear()
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        self.source = s
+        reached[s] = gen
+        dist[s] = 0.0
+        pred[s] = -1
+        heap.append((0.0, s))
+
+        while heap:
+            d_u, u = heappop(heap)
+            if d_u > dist[u]:
+                continue
+            if d_u > limit:
+                break
+            settled[u] = gen
+            order.append(u)
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+            for i in range(offsets[u], offsets[u + 1]):
+                v = edge_targets[i]
+                new_dist = d_u + weights[i]
+                if reached[v] != gen or new_dist < dist[v]:
+                    reached[v] = gen
+                    dist[v] = new_dist
+                    pred[v] = u
+                    heappush(heap, (new_dist, v))
+        return self
+
+    # Results of the last query
+
+    def distance(self, node: Node) -> float:
+        """Final distance to node, or inf if it was not settled."""
+        v = self.graph.dense_id(node)
+        return self.dist[v] if self.settled[v] == self.generation else INF
+
+    def path(self, node: Node) -> List[Hashable]:
+        """Shortest path from the source to node, or [] if it was not settled."""
+        v = self.graph.dense_id(node)
+        if self.settled[v] != self.generation:
+            return []
+        nodes = []
+        while v >= 0:
+            nodes.append(v)
+            v = self.pred[v]
+        ids = self.graph.node_ids
+        return [ids[u] for u in reversed(nodes)]
+
+    def items(self) -> Iterator[Tuple[Hashable, float]]:
+        """(node, distance) for every settled node, in settle order."""
+        ids, dist = self.graph.node_ids, self.dist
+        return ((ids[u], dist[u]) for u in self.order)
+
+    def to_dict(self) -> Dict[Hashable, float]:
+        """Same shape as the dict returned by the Round implementations."""
+        return dict(self.items())
+
+_local = threading.local()
+
+def workspace_for(graph: CSRGraph) -> DijkstraWorkspace:
+    """
+    The calling thread's workspace for graph, created on first use. Each
+    thread keeps the WORKSPACE_SLOTS most recently used ones, so workspaces
+    (and the graphs they reference) of graphs no longer queried are dropped.
+    """
+    cache: "OrderedDict[int, DijkstraWorkspace]" = getattr(_local, "workspaces", None)
+    if cache is None:
+        cache = _local.workspaces = OrderedDict()
+    ws = cache.get(id(graph))
+    if ws is None or ws.graph is not graph:
+        ws = cache[id(graph)] = DijkstraWorkspace(graph)
+        if len(cache) > WORKSPACE_SLOTS:
+            cache.popitem(last=False)
+    cache.move_to_end(id(graph))
+    return ws
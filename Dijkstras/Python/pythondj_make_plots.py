@@ -18,11 +18,11 @@ for prob in edge_probs:
     plt.figure(figsize=(10, 6))
     
     # Define colors for algorithms
-    colors = ['blue', 'orange', 'green', 'red']
-    markers = ['o', 's', '^', 'D']
+    colors = ['blue', 'orange', 'green', 'red', 'purple', 'brown', 'olive']
+    markers = ['o', 's', '^', 'D', 'v', 'P', 'X']
     
     # Define the order we want to plot algorithms
-    algorithm_order = ['chatgpt', 'claude', 'deepseek', 'gemini']
+    algorithm_order = ['chatgpt', 'claude', 'deepseek', 'gemini', 'csr', 'auto', 'bf']
     
     for i, algo in enumerate(algorithm_order):
         if algo in df_sub["algorithm"].values:
@@ -65,7 +65,10 @@ color_map = {
     'chatgpt': 'blue',    # Blue for Chatgpt
     'claude': 'orange',   # Orange for Claude
     'deepseek': 'green',  # Green for Deepseek
-    'gemini': 'red'       # Red for Gemini
+    'gemini': 'red',      # Red for Gemini
+    'csr': 'purple',      # Purple for the CSR engine
+    'auto': 'brown',      # Brown for the dense/sparse auto engine
+    'bf': 'olive'         # Olive for the frontier-batched Bellman-Ford engine
 }
 
 for idx, prob in enumerate(edge_probs):
@@ -73,7 +76,7 @@ for idx, prob in enumerate(edge_probs):
     df_sub = df[df["edge_prob"] == prob]
     
     # Plot in consistent order
-    for algo in ['chatgpt', 'claude', 'deepseek', 'gemini']:
+    for algo in algorithm_order:
         if algo in df_sub["algorithm"].values:
             group = df_sub[df_sub["algorithm"] == algo]
             group_sorted = group.sort_values("num_nodes")
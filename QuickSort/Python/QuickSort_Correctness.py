@@ -4,13 +4,20 @@ Correctness test harness for Python sorting algorithms.
 
 Assumes each algorithm is a function:
     def quicksort(a: list[int]) -> None
+
+Each randomized case is generated from its own seed, and its expected output
+comes from the on-disk reference cache (see QuickSort_ReferenceCache.py), so
+only the first run pays for sorted().
 """
 
 from __future__ import annotations
+from array import array
 from typing import Callable, Dict, List, Tuple
 import random
 import traceback
 
+from QuickSort_ReferenceCache import ReferenceCache
+
 # Import Algorithms
 
 from QuickSort_ChatGPT import quicksort as quicksort_chatgpt
@@ -79,11 +86,26 @@ DISTRIBUTIONS: Dict[str, Callable[[int], List[int]]] = {
 SIZES = [0, 1, 2, 5, 10, 100, 1000, 5000]
 CASES_PER_COMBO = 20  # number of random arrays per (distribution, size)
 
+REFERENCE_CACHE_DIR = "reference_cache"
+
+def gen_case(dist_name: str, n: int, seed: int) -> List[int]:
+    """Generate one case from its own seed so it can be keyed in the reference cache."""
+    random.seed(f"{dist_name}:{n}:{seed}")
+    return DISTRIBUTIONS[dist_name](n)
+
+def matches_reference(arr: List[int], expected: memoryview) -> bool:
+    """Compare a sorted list to a cached reference; a wrong element type is a mismatch."""
+    try:
+        got = array("q", arr)
+    except (TypeError, OverflowError):
+        return False  # None, floats or ints outside int64 cannot match
+    return memoryview(got) == expected
+
 # Run Tests
 
 def run_correctness_tests() -> None:
 
-    random.seed(1)  # for reproducibility
+    cache = ReferenceCache(REFERENCE_CACHE_DIR)
 
     for algo_name, sort_func in ALGORITHMS.items():
         print("=" * 70)
@@ -110,33 +132,36 @@ def run_correctness_tests() -> None:
 
         # Randomized distributions
         print("  Randomized distributions:")
-        for dist_name, generator in DISTRIBUTIONS.items():
+        for dist_name in DISTRIBUTIONS:
             dist_tests = 0
             dist_failures = 0
             dist_exceptions = 0
 
             for n in SIZES:
-                for _ in range(CASES_PER_COMBO):
-                    arr = generator(n)
-                    expected = sorted(arr)
+                for seed in range(CASES_PER_COMBO):
+                    arr = gen_case(dist_name, n, seed)
+                    expected = cache.get_or_compute(
+                        dist_name, {"n": n}, seed, lambda: sorted(arr)
+                    )
                     test_input = list(arr)  # keep original for debugging
                     total_tests += 1
                     dist_tests += 1
                     try:
                         sort_func(arr)
-                        if arr != expected:
-                            total_failures += 1
-                            dist_failures += 1
-                            print(
-                                f"    FAIL {dist_name}, n={n}: "
-                                f"input(sample)={test_input[:10]}, "
-                                f"got(sample)={arr[:10]}, expected(sample)={expected[:10]}"
-                            )
                     except Exception as e:
                         total_exceptions += 1
                         dist_exceptions += 1
                         #print(f"    EXCEPTION {dist_name}, n={n}: {e}")
                         #traceback.print_exc(limit=1)
+                        continue
+                    if not matches_reference(arr, expected):
+                        total_failures += 1
+                        dist_failures += 1
+                        print(
+                            f"    FAIL {dist_name}, n={n}: "
+                            f"input(sample)={test_input[:10]}, "
+                            f"got(sample)={arr[:10]}, expected(sample)={expected[:10].tolist()}"
+                        )
 
             print(
                 f"    {dist_name}: tests={dist_tests}, "
@@ -150,6 +175,7 @@ def run_correctness_tests() -> None:
         )
         print()
 
+    print(f"Reference cache: hits={cache.hits}, misses={cache.misses}")
     print("All correctness tests completed.")
 
 
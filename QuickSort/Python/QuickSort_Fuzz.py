@@ -0,0 +1,267 @@
+# QuickSort_Fuzz.py
+"""
+Parallel differential fuzzer for Python sorting algorithms.
+
+Every worker process generates random arrays until the time budget runs out
+and checks each algorithm in ALGORITHMS against sorted() and against the other
+implementations. A failing input is shrunk to a minimal counterexample
+(delta debugging on the length, then on the values) and written to a replay
+corpus. Corpus cases are always replayed first on the next run.
+
+Usage:
+    python QuickSort_Fuzz.py --seconds 60 --workers 8 --corpus fuzz_corpus
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+
+from QuickSort_Correctness import ALGORITHMS, DISTRIBUTIONS
+
+SortFunc = Callable[[List[int]], None]
+
+# Case Generation
+
+# Most cases are tiny: bugs in partitioning show up on short arrays, and short
+# arrays are what lets us check millions of cases per minute.
+SMALL_SIZES = list(range(0, 17))
+LARGE_SIZES = [32, 64, 128, 256]
+LARGE_SIZE_PROB = 0.02
+
+def gen_tiny_values(n: int) -> List[int]:
+    """Values in {-1, 0, 1}: lots of ties around the pivot."""
+    return [random.randint(-1, 1) for _ in range(n)]
+
+def gen_organ_pipe(n: int) -> List[int]:
+    """Ascending then descending."""
+    half = [random.randint(-100, 100) for _ in range(n // 2)]
+    half.sort()
+    tail = [random.randint(-100, 100) for _ in range(n - n // 2)]
+    tail.sort(reverse=True)
+    return half + tail
+
+FUZZ_DISTRIBUTIONS: Dict[str, Callable[[int], List[int]]] = dict(DISTRIBUTIONS)
+FUZZ_DISTRIBUTIONS["tiny_values"] = gen_tiny_values
+FUZZ_DISTRIBUTIONS["organ_pipe"] = gen_organ_pipe
+
+def gen_case() -> List[int]:
+    if random.random() < LARGE_SIZE_PROB:
+        n = random.choice(LARGE_SIZES)
+    else:
+        n = random.choice(SMALL_SIZES)
+    generator = random.choice(list(FUZZ_DISTRIBUTIONS.values()))
+    return generator(n)
+
+# Checking
+
+def run_algorithm(sort_func: SortFunc, arr: List[int]) -> Tuple[Optional[List[int]], Optional[str]]:
+    """Sort a copy of arr. Returns (output, None) or (None, error description)."""
+    a = list(arr)
+    try:
+        sort_func(a)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return a, None
+
+def check_case(arr: List[int]) -> Dict[str, str]:
+    """
+    Run every algorithm on arr.
+
+    Returns algo_name -> failure description for the algorithms that raised,
+    disagreed with sorted(), or disagreed with the other implementations.
+    An empty dict means every algorithm agreed with the reference.
+    """
+    expected = sorted(arr)
+    outputs: Dict[str, Optional[List[int]]] = {}
+    failures: Dict[str, str] = {}
+
+    for name, sort_func in ALGORITHMS.items():
+        got, err = run_algorithm(sort_func, arr)
+        outputs[name] = got
+        if err is not None:
+            failures[name] = f"exception: {err}"
+        elif got != expected:
+            failures[name] = "wrong output"
+
+    if failures:
+        # Differential view: group the implementations that produced the same
+        # wrong answer so shared bugs are easy to spot in the report.
+        for name in failures:
+            got = outputs[name]
+            if got is None:
+                continue
+            same = [other for other in failures
+                    if other != name and outputs[other] == got]
+            if same:
+                failures[name] += f" (same output as {', '.join(same)})"
+    return failures
+
+def still_fails(sort_func: SortFunc, arr: List[int]) -> bool:
+    got, err = run_algorithm(sort_func, arr)
+    return err is not None or got != sorted(arr)
+
+# Shrinking
+
+def shrink_length(sort_func: SortFunc, arr: List[int]) -> List[int]:
+    """ddmin on the list: remove chunks while the failure reproduces."""
+    chunks = 2
+    while len(arr) >= 2:
+        chunk = max(1, len(arr) // chunks)
+        removed = False
+        start = 0
+        while start < len(arr):
+            candidate = arr[:start] + arr[start + chunk:]
+            if still_fails(sort_func, candidate):
+                arr = candidate
+                removed = True
+                chunks = max(chunks - 1, 2)
+            else:
+                start += chunk
+        if not removed:
+            if chunk == 1:
+                break
+            chunks = min(chunks * 2, len(arr))
+    if len(arr) == 1 and still_fails(sort_func, []):
+        return []
+    return arr
+
+def shrink_values(sort_func: SortFunc, arr: List[int]) -> List[int]:
+    """Replace values by their ranks, then move each value toward zero."""
+    ranks = {v: i for i, v in enumerate(sorted(set(arr)))}
+    candidate = [ranks[v] for v in arr]
+    if still_fails(sort_func, candidate):
+        arr = candidate
+
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(arr)):
+            v = arr[i]
+            for smaller in (0, v // 2, v - 1 if v > 0 else v + 1):
+                if abs(smaller) >= abs(v):
+                    continue
+                candidate = arr[:i] + [smaller] + arr[i + 1:]
+                if still_fails(sort_func, candidate):
+                    arr = candidate
+                    changed = True
+                    break
+    return arr
+
+def shrink(sort_func: SortFunc, arr: List[int]) -> List[int]:
+    arr = shrink_length(sort_func, list(arr))
+    arr = shrink_values(sort_func, arr)
+    # Smaller values can make more elements removable
+    return shrink_length(sort_func, arr)
+
+# Replay Corpus
+
+def case_id(algo_name: str, arr: List[int]) -> str:
+    digest = hashlib.sha1(json.dumps([algo_name, arr]).encode()).hexdigest()
+    return f"{algo_name}-{digest[:12]}"
+
+def write_corpus_case(corpus_dir: str, algo_name: str, arr: List[int], failure: str) -> str:
+    os.makedirs(corpus_dir, exist_ok=True)
+    cid = case_id(algo_name, arr)
+    path = os.path.join(corpus_dir, cid + ".json")
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            json.dump({"algorithm": algo_name, "input": arr, "failure": failure}, f)
+    return cid
+
+def load_corpus(corpus_dir: str) -> List[Dict[str, object]]:
+    if not os.path.isdir(corpus_dir):
+        return []
+    cases = []
+    for fname in sorted(os.listdir(corpus_dir)):
+        if fname.endswith(".json"):
+            with open(os.path.join(corpus_dir, fname)) as f:
+                cases.append(json.load(f))
+    return cases
+
+def replay_corpus(corpus_dir: str) -> int:
+    """Run every corpus case against every algorithm. Returns the failure count."""
+    cases = load_corpus(corpus_dir)
+    if not cases:
+        return 0
+    print(f"Replaying {len(cases)} corpus case(s) from {corpus_dir}")
+    total_failures = 0
+    for case in cases:
+        failures = check_case(case["input"])
+        for name, failure in failures.items():
+            total_failures += 1
+            print(f"  FAIL {name}: input={case['input']} ({failure})")
+    print(f"Corpus replay: failures={total_failures}")
+    return total_failures
+
+# Fuzzing Workers
+
+MAX_SHRINKS_PER_ALGO = 3  # per worker; later failures are only counted
+
+def fuzz_worker(args: Tuple[int, float, str]) -> Dict[str, object]:
+    seed, deadline, corpus_dir = args
+    random.seed(seed)
+
+    cases = 0
+    failure_counts: Dict[str, int] = {name: 0 for name in ALGORITHMS}
+    found: List[Tuple[str, List[int], str]] = []
+
+    while time.time() < deadline:
+        # Check the clock once per batch, not once per case
+        for _ in range(256):
+            arr = gen_case()
+            cases += 1
+            failures = check_case(arr)
+            for name, failure in failures.items():
+                failure_counts[name] += 1
+                if failure_counts[name] <= MAX_SHRINKS_PER_ALGO:
+                    small = shrink(ALGORITHMS[name], arr)
+                    write_corpus_case(corpus_dir, name, small, failure)
+                    found.append((name, small, failure))
+
+    return {"cases": cases, "failure_counts": failure_counts, "found": found}
+
+def fuzz(seconds: float, workers: int, corpus_dir: str, seed: int = 1) -> int:
+    """Replay the corpus, then fuzz. Returns the total failure count (corpus plus fuzzing)."""
+    total_failures = replay_corpus(corpus_dir)
+
+    print(f"Fuzzing {len(ALGORITHMS)} algorithms for {seconds:.0f}s on {workers} worker(s)")
+    deadline = time.time() + seconds
+    jobs = [(seed * 1_000_003 + i, deadline, corpus_dir) for i in range(workers)]
+    start = time.perf_counter()
+    with mp.Pool(workers) as pool:
+        results = pool.map(fuzz_worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    total_cases = sum(r["cases"] for r in results)
+    print("-" * 70)
+    print(f"cases={total_cases}, elapsed={elapsed:.1f}s, "
+          f"rate={total_cases / elapsed * 60:,.0f} cases/min")
+
+    seen = set()
+    for name in ALGORITHMS:
+        failures = sum(r["failure_counts"][name] for r in results)
+        total_failures += failures
+        print(f"  {name}: failures={failures}")
+        for r in results:
+            for algo_name, small, failure in r["found"]:
+                cid = case_id(algo_name, small)
+                if algo_name == name and cid not in seen:
+                    seen.add(cid)
+                    print(f"    minimal counterexample: {small} ({failure}) -> {cid}.json")
+    return total_failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Differential fuzzing of the quicksort implementations")
+    parser.add_argument("--seconds", type=float, default=60.0, help="time budget")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--corpus", default="fuzz_corpus", help="replay corpus directory")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    sys.exit(1 if fuzz(args.seconds, args.workers, args.corpus, args.seed) else 0)
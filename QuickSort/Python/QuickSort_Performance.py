@@ -4,10 +4,18 @@ Performance benchmark harness for Python sorting algorithms.
 
 Assumes each algorithm is a function:
     def quicksort(a: list[int]) -> None
+
+Every timed run is verified outside the timer with an O(n) sortedness scan
+and a multiset fingerprint compared against the input. Runs that fail the
+check are counted in the failed_runs column and left out of the statistics;
+the runs column counts only the successful runs.
 """
 
 from __future__ import annotations
 from typing import Callable, Dict, List, Tuple
+import itertools
+import operator
+import os
 import random
 import time
 import statistics
@@ -86,19 +94,54 @@ def precompute_inputs() -> Dict[Tuple[str, int, int], List[int]]:
                 inputs[(dist_name, n, run_idx)] = generator(n)
     return inputs
 
-def time_one_run(sort_func: SortFunc, arr: List[int]) -> float:
-    """Time a single call to sort_func on a copy of arr."""
-    a = list(arr)  
+def time_one_run(sort_func: SortFunc, arr: List[int]) -> Tuple[float, List[int]]:
+    """Time a single call to sort_func on a copy of arr. Returns (seconds, sorted copy)."""
+    a = list(arr)
     t0 = time.perf_counter()
     sort_func(a)
     t1 = time.perf_counter()
-    return t1 - t0
+    return t1 - t0, a
+
+# Output verification
+
+FINGERPRINT_MOD = (1 << 61) - 1  # Mersenne prime
+
+def new_fingerprint_point() -> int:
+    """Random evaluation point, drawn independently of the seeded workload RNG."""
+    return int.from_bytes(os.urandom(8), "little") % FINGERPRINT_MOD
+
+def multiset_fingerprint(arr: List[int], r: int) -> int:
+    """
+    Order-independent fingerprint: prod(r - x) mod p.
+
+    Two different multisets of size n collide with probability at most n / p
+    over the random choice of r, and the computation is a single O(n) pass.
+    """
+    acc = 1
+    for x in arr:
+        acc = acc * (r - x) % FINGERPRINT_MOD
+    return acc
+
+def is_sorted(arr: List[int]) -> bool:
+    return all(map(operator.le, arr, itertools.islice(arr, 1, None)))
+
+def verify_output(out: List[int], expected_len: int, expected_fp: int, r: int) -> bool:
+    """O(n) check that out is a sorted permutation of the input."""
+    return (
+        len(out) == expected_len
+        and is_sorted(out)
+        and multiset_fingerprint(out, r) == expected_fp
+    )
 
 def benchmark() -> List[Dict[str, object]]:
 
     random.seed(1)  # for reproducibility
     base_inputs = precompute_inputs()
 
+    # Fingerprint each input once; every algorithm's output is checked against it
+    r = new_fingerprint_point()
+    input_fps = {key: multiset_fingerprint(arr, r) for key, arr in base_inputs.items()}
+
     results: List[Dict[str, object]] = []
 
     for algo_name, sort_func in ALGORITHMS.items():
@@ -107,23 +150,36 @@ def benchmark() -> List[Dict[str, object]]:
         for dist_name in DISTRIBUTIONS.keys():
             for n in SIZES:
                 durations: List[float] = []
+                failed_runs = 0
 
                 # multiple runs
                 for run_idx in range(RUNS_PER_COMBO):
-                    arr = base_inputs[(dist_name, n, run_idx)]
-                    dt = time_one_run(sort_func, arr)
+                    key = (dist_name, n, run_idx)
+                    arr = base_inputs[key]
+                    try:
+                        dt, out = time_one_run(sort_func, arr)
+                    except Exception:
+                        failed_runs += 1
+                        continue
+                    if not verify_output(out, len(arr), input_fps[key], r):
+                        failed_runs += 1
+                        continue
                     durations.append(dt)
 
-                durations.sort()
-                median = statistics.median(durations)
-                mean = statistics.mean(durations)
-                min_t = durations[0]
-                max_t = durations[-1]
+                if durations:
+                    durations.sort()
+                    median = statistics.median(durations)
+                    mean = statistics.mean(durations)
+                    min_t = durations[0]
+                    max_t = durations[-1]
+                else:
+                    median = mean = min_t = max_t = float("nan")
 
                 print(
                     f"{dist_name:13s} | n={n:4d} | "
                     f"median={median:.6f}s | mean={mean:.6f}s | "
                     f"min={min_t:.6f}s | max={max_t:.6f}s"
+                    + (f" | FAILED {failed_runs}/{RUNS_PER_COMBO}" if failed_runs else "")
                 )
 
                 results.append(
@@ -131,7 +187,8 @@ def benchmark() -> List[Dict[str, object]]:
                         "algorithm": algo_name,
                         "distribution": dist_name,
                         "n": n,
-                        "runs": RUNS_PER_COMBO,
+                        "runs": len(durations),
+                        "failed_runs": failed_runs,
                         "median_sec": median,
                         "mean_sec": mean,
                         "min_sec": min_t,
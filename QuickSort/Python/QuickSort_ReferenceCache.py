@@ -0,0 +1,87 @@
+# QuickSort_ReferenceCache.py
+"""
+On-disk golden-reference cache for the correctness harness.
+
+Expected outputs are keyed by (generator name, generator parameters, seed)
+and stored as raw little-endian machine arrays, one file per key under a
+content-addressed path. Later runs memory-map the file instead of recomputing
+the reference, so a cached case costs one mmap instead of a sorted() call.
+
+Bump CACHE_VERSION whenever a generator changes what it produces for a seed.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Callable, Dict, Iterable, Optional
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+CACHE_VERSION = 1
+
+class ReferenceCache:
+    def __init__(self, cache_dir: str = "reference_cache", typecode: str = "q") -> None:
+        self.cache_dir = cache_dir
+        self.typecode = typecode
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, generator: str, params: Dict[str, object], seed: object) -> str:
+        blob = json.dumps(
+            [CACHE_VERSION, self.typecode, generator, params, seed],
+            sort_keys=True,
+        )
+        return hashlib.sha1(blob.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".bin")
+
+    def load(self, key: str) -> Optional[memoryview]:
+        """Memory-map a cached reference, or return None if it is not cached."""
+        try:
+            f = open(self.path(key), "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return memoryview(array(self.typecode))
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        if sys.byteorder != "little":
+            # Rare path: byte-swap into memory instead of mapping
+            values = array(self.typecode, view.tobytes())
+            values.byteswap()
+            return memoryview(values)
+        return view.cast(self.typecode)
+
+    def store(self, key: str, values: Iterable) -> memoryview:
+        data = array(self.typecode, values)
+        out = data
+        if sys.byteorder != "little":
+            out = array(self.typecode, data)
+            out.byteswap()
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            out.tofile(f)
+        os.replace(tmp, path)  # atomic, so concurrent runs never see a partial file
+        return memoryview(data)
+
+    def get_or_compute(
+        self,
+        generator: str,
+        params: Dict[str, object],
+        seed: object,
+        compute: Callable[[], Iterable],
+    ) -> memoryview:
+        key = self.key(generator, params, seed)
+        cached = self.load(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        return self.store(key, compute())